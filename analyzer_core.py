@@ -0,0 +1,608 @@
+"""
+Resume extraction and LLM analysis, independent of the Streamlit UI.
+
+Workers, CLIs and tests can import this module without loading Streamlit. PyPDF2
+and requests are only imported once a PDF is parsed or an LLM request is sent.
+"""
+import re
+import contextvars
+from typing import TYPE_CHECKING, Callable, Dict, List, Optional, Set, Tuple
+import json
+import logging
+from contextlib import nullcontext
+from functools import lru_cache
+from config import config
+from metrics import RequestTrace, metrics, timed
+from skill_matcher import skill_matcher
+from section_segmenter import Section, section_leads, segment_resume
+from llm_cache import LLMCache, llm_cache
+from llm_client import LLMError, llm_client
+from streaming_json import StreamingAnalysisParser
+from resume_compactor import compact_resume
+
+if TYPE_CHECKING:
+    from jobs import Job
+
+logger = logging.getLogger(__name__)
+
+# Messages meant for the user (failed analyses, truncated streams) are collected here
+# and rendered by whoever owns the analysis, e.g. the web app session that started the job
+_message_sink: 'contextvars.ContextVar[Optional[List[Tuple[str, str]]]]' = contextvars.ContextVar('message_sink', default=None)
+
+_MESSAGE_LOG_LEVELS = {'error': logging.ERROR, 'warning': logging.WARNING, 'info': logging.INFO}
+
+# Bump whenever the LLM prompt changes so cached analyses from the old prompt are not reused
+PROMPT_VERSION = "2"
+# Same for the multi-role prompt, whose per-role results are cached separately
+MULTI_ROLE_PROMPT_VERSION = "multi-1"
+# And for analyses updated from an edited resume's changed sections
+REVISION_PROMPT_VERSION = "revision-1"
+
+# Keys of the LLM analysis and their headings in the AI Suggestions tab
+SUGGESTION_SECTIONS = [
+    ("strengths", "Strengths"),
+    ("improvements", "Areas for Improvement"),
+    ("missing_skills", "Missing Skills"),
+    ("wording_suggestions", "Wording & Formatting Suggestions"),
+]
+
+# Extraction patterns are compiled once per process. Every repetition is bounded, so each
+# findall does a constant amount of work per position and stays linear in the text length.
+SKILL_SEPARATOR_PATTERN = re.compile(r'[,;]')
+
+EDUCATION_KEYWORDS = [
+    'Bachelor', 'Master', 'PhD', 'Doctorate', 'Degree', 'B.Sc', 'M.Sc', 'B.Tech', 'M.Tech',
+    'B.A.', 'M.A.', 'B.Com', 'M.Com', 'BBA', 'MBA', 'B.E.', 'M.E.', 'B.Eng', 'M.Eng',
+    'Associate', 'Diploma', 'Certification', 'Certified', 'Certificate', 'Coursework',
+    'University', 'College', 'Institute', 'School', 'Academy', 'Campus'
+]
+
+@lru_cache(maxsize=None)
+def education_keyword_patterns() -> Tuple['re.Pattern', ...]:
+    # Only needed for resumes without an education section, and these take longer to
+    # compile than every other table together, so they are built on first use
+    return tuple(
+        re.compile(r'\b' + re.escape(keyword) + r'[\w\s,.\-&()]{0,100}?([A-Z][a-z\s]{5,50}?)(University|College|Institute|School)', re.IGNORECASE)
+        for keyword in EDUCATION_KEYWORDS
+    )
+
+DEGREE_PATTERNS = [
+    re.compile(r'\b([A-Z][a-z]{1,30}\b(?:\s+[A-Z][a-z]{1,30}\b){0,4})\s*(?:in|at)?\s*([A-Z][a-z]{1,30}\b(?:\s+[A-Z][a-z]{1,30}\b){0,4})\s*(?:at|from)?\s*([A-Z][A-Za-z\s]{0,80}University|College|Institute)', re.IGNORECASE),
+    re.compile(r'(Bachelor|Master|PhD|B\.[A-Z]{1,10}|M\.[A-Z]{1,10}|B\.Tech|M\.Tech)[\w\s,.\-&()]{0,200}?(University|College|Institute)?[\w\s,.\-&()]{0,200}', re.IGNORECASE),
+]
+
+COMPANY_SUFFIX_PATTERN = re.compile(r'(Inc\.?|Ltd\.?|LLC|Corp\.?|Group)', re.IGNORECASE)
+
+COMPANY_POSITION_PATTERNS = [
+    re.compile(r'([A-Z][A-Za-z\s&.,\-()]{0,60}(?:Inc\.?|Ltd\.?|LLC|Corp\.?|Group)?)\s*[-,]\s*([A-Z][a-z\s]{5,40})', re.IGNORECASE),
+    re.compile(r'\b([A-Z][A-Za-z\s&.,\-()]{0,60}(?:Inc\.?|Ltd\.?|LLC|Corp\.?|Group)?).{0,20}(?:\bat\b|@)\s*([A-Z][a-z\s]{5,40})', re.IGNORECASE),
+    re.compile(r'([A-Z][a-z\s]{5,40})\s*(?:\bat\b|@)\s*([A-Z][A-Za-z\s&.,\-()]{0,60}(?:Inc\.?|Ltd\.?|LLC|Corp\.?|Group)?)', re.IGNORECASE),
+]
+
+JOB_PATTERNS = [
+    re.compile(r'([A-Z][A-Za-z\s]{5,30})\s*(?:\bat\b|@)\s*([A-Z][A-Za-z\s&.,\-()]{0,60}(?:Inc\.?|Ltd\.?|LLC|Corp\.?|Group)?)'),
+    re.compile(r'([A-Z][A-Za-z\s&.,\-()]{0,60}(?:Inc\.?|Ltd\.?|LLC|Corp\.?|Group)?)\s*(?:-|,)\s*([A-Z][A-Za-z\s]{5,30})'),
+]
+
+@timed('extract_skills')
+def extract_skills(text: str, sections: Optional[List[Section]] = None) -> List[str]:
+    """
+    Extract skills from the resume text
+    """
+    # Single pass over the text with the precompiled taxonomy matcher
+    skills = skill_matcher.find_skills(text)
+    
+    # Additional skills from common sections
+    # Look for skills section
+    if sections is None:
+        sections = segment_resume(text)
+    # Each skills section is split on its own, so entries never run across sections
+    for skills_text in section_leads(sections, 'skills'):
+        skills |= skills_listed_in(skills_text)
+    
+    return list(skills)
+
+def skills_listed_in(skills_text: str) -> Set[str]:
+    """
+    Entries of a skills section that look like skills
+    """
+    skills = set()
+    # Extract individual skills (comma-separated)
+    individual_skills = SKILL_SEPARATOR_PATTERN.split(skills_text)
+    for skill in individual_skills:
+        skill = skill.strip().strip('-').strip()
+        if len(skill) > 2:  # Filter out very short entries
+            # Check if the skill is in our known list or looks like a skill
+            if skill in skill_matcher.canonical_skills or len(skill.split()) <= 3:
+                skills.add(skill)
+    return skills
+
+@timed('extract_education')
+def extract_education(text: str, sections: Optional[List[Section]] = None) -> List[str]:
+    """
+    Extract education information from the resume text
+    """
+    education = set()
+    
+    # Look for education section
+    if sections is None:
+        sections = segment_resume(text)
+    for education_text in section_leads(sections, 'education'):
+        education |= degrees_in(education_text)
+    
+    # If no education section found, look for education keywords throughout the text
+    if not education:
+        education = education_keywords_in(text)
+    
+    return list(education)
+
+def degrees_in(education_text: str) -> Set[str]:
+    """
+    Degree and institution details found in an education section
+    """
+    education = set()
+    # Pattern: Degree followed by field and institution
+    for pattern in DEGREE_PATTERNS:
+        matches = pattern.findall(education_text)
+        for match in matches:
+            if isinstance(match, tuple):
+                # Combine all non-empty parts of the match
+                edu_info = ' '.join([part for part in match if part.strip()])
+                if edu_info:
+                    education.add(edu_info.strip())
+            else:
+                education.add(match.strip())
+    return education
+
+def education_keywords_in(text: str) -> Set[str]:
+    """
+    Education mentioned anywhere in the text, for resumes without an education section
+    """
+    education = set()
+    for pattern in education_keyword_patterns():
+        matches = pattern.findall(text)
+        for match in matches:
+            if isinstance(match, tuple):
+                education.add(f"{match[0]} {match[1]}")
+            else:
+                education.add(match)
+    return education
+
+def _add_experience(experiences: set, part1: str, part2: str):
+    # Determine which part is company and which is position
+    # Usually the longer string or the one containing 'Inc', 'Ltd', etc. is the company
+    if COMPANY_SUFFIX_PATTERN.search(part1) or len(part1) > len(part2):
+        experiences.add(f"{part2} at {part1}")
+    else:
+        experiences.add(f"{part1} at {part2}")
+
+@timed('extract_work_experience')
+def extract_work_experience(text: str, sections: Optional[List[Section]] = None) -> List[str]:
+    """
+    Extract work experience from the resume text
+    """
+    # Look for work experience section
+    if sections is None:
+        sections = segment_resume(text)
+    exp_sections = [section for section in sections if section.name == 'experience']
+    # Without a recognisable experience section, look for job titles and companies
+    # over the whole text
+    if not exp_sections:
+        return list(experiences_in(text, section=False))
+    experiences = set()
+    # Matched block by block, so no entry runs from one job into the next. The looser
+    # company/position patterns only read the first block; later ones (usually further
+    # jobs with their bullet points) only the 'Title at Company' style
+    for section in exp_sections:
+        for i, block in enumerate(section.blocks):
+            experiences |= experiences_in(block, section=i == 0)
+    return list(experiences)
+
+def experiences_in(text: str, section: bool = True) -> Set[str]:
+    """
+    'Position at Company' entries found in an experience section, or with section=False,
+    in text outside one (which only looks for the 'Title at Company' style)
+    """
+    experiences = set()
+    patterns = COMPANY_POSITION_PATTERNS + JOB_PATTERNS if section else JOB_PATTERNS
+    # Patterns: Company - Position, Company, Position, Title at Company
+    for pattern in patterns:
+        for match in pattern.findall(text):
+            if len(match) >= 2:
+                _add_experience(experiences, match[0].strip(), match[1].strip())
+    return experiences
+
+def prepare_resume_for_prompt(resume_text: str, extracted: Optional[Dict] = None) -> str:
+    """
+    Compact the resume text to fit PROMPT_TOKEN_BUDGET, reusing extraction results when given
+    """
+    if config.PROMPT_TOKEN_BUDGET <= 0:
+        return resume_text
+    if extracted is None:
+        sections = segment_resume(resume_text)
+        extracted = {
+            'skills': extract_skills(resume_text, sections),
+            'education': extract_education(resume_text, sections),
+            'work_experience': extract_work_experience(resume_text, sections)
+        }
+    with metrics.timer('prompt_compaction'):
+        return compact_resume(resume_text, extracted['skills'], extracted['education'],
+                              extracted['work_experience'], config.PROMPT_TOKEN_BUDGET)
+
+def build_analysis_prompt(resume_text: str, target_job: str) -> str:
+    """
+    Build the LLM prompt for analyzing a resume against a target job
+    """
+    return f"Analyze this resume for the target job role '{target_job}'. \nResume: {resume_text}\n\nPlease provide:\n1. Strengths in the resume relevant to the target role\n2. Areas for improvement\n3. Missing skills for the target role\n4. Wording and formatting suggestions\n\nFormat your response as a JSON object with keys: strengths, improvements, missing_skills, wording_suggestions.\nEach value should be a list of strings."
+
+def build_multi_role_prompt(resume_text: str, target_jobs: List[str]) -> str:
+    """
+    Build one LLM prompt analyzing a resume against several target job roles.
+    The instructions and resume come first and the roles last, so requests for
+    different role sets share a long common prefix that provider prompt caches can reuse.
+    """
+    roles = "\n".join(f"- {target_job}" for target_job in target_jobs)
+    return ("Analyze this resume against each of the target job roles listed after it.\n"
+            f"Resume: {resume_text}\n\n"
+            "For each role, please provide:\n1. Strengths in the resume relevant to the role\n2. Areas for improvement\n"
+            "3. Missing skills for the role\n4. Wording and formatting suggestions\n5. A fit score from 0 to 100\n\n"
+            "Format your response as a JSON object with a single key 'roles' that maps each role name, exactly as "
+            "listed, to an object with keys: strengths, improvements, missing_skills, wording_suggestions, fit_score.\n"
+            "fit_score should be a number and every other value a list of strings.\n\n"
+            f"Target job roles:\n{roles}")
+
+def build_revision_prompt(previous_analysis: Dict, changes: List[Tuple[str, str]], target_job: str) -> str:
+    """
+    Build the LLM prompt updating a previous analysis after the resume was edited.
+    changes holds a (title, new text) pair per added, edited or removed section.
+    """
+    previous = json.dumps({key: previous_analysis.get(key, []) for key, _ in SUGGESTION_SECTIONS})
+    edits = "\n\n".join(f"### {title}\n{text.strip()}" if text.strip() else f"### {title}" for title, text in changes)
+    return (f"You analyzed a resume for the target job role '{target_job}' and the candidate has since edited it. "
+            "Only the sections that changed are shown below, with their new text (removed sections have none).\n"
+            f"Previous analysis: {previous}\n\nChanged sections:\n{edits}\n\n"
+            "Please update the analysis for the edited resume: keep the points that still apply, revise or drop the "
+            "ones the edits affect, and add any the edits call for.\n\n"
+            "Format your response as a JSON object with keys: strengths, improvements, missing_skills, wording_suggestions.\n"
+            "Each value should be a list of strings.")
+
+def build_llm_payload(prompt: str, max_tokens: Optional[int] = None) -> Dict:
+    """
+    Build the chat completion request body for a prompt
+    """
+    return {
+        "model": config.LLM_MODEL,
+        "messages": [
+            {
+                "role": "user",
+                "content": prompt
+            }
+        ],
+        "temperature": config.TEMPERATURE,
+        "max_tokens": max_tokens or config.MAX_TOKENS,
+        "reasoning": {"enabled": config.REASONING_ENABLED}
+    }
+
+def fallback_analysis() -> Dict:
+    """
+    Generic suggestions shown when the LLM analysis fails
+    """
+    metrics.increment('llm_fallbacks_total')
+    return {
+        "strengths": ["Resume contains relevant technical skills"],
+        "improvements": ["Consider adding more specific examples of achievements"],
+        "missing_skills": ["Additional skills may be needed for your target role"],
+        "wording_suggestions": ["Use action verbs to start each bullet point"]
+    }
+
+def show_message(level: str, message: str):
+    """
+    Collect an error/warning/info message for the caller to show, or log it when
+    nobody is collecting (e.g. batch runs)
+    """
+    sink = _message_sink.get()
+    if sink is not None:
+        sink.append((level, message))
+    else:
+        logger.log(_MESSAGE_LOG_LEVELS.get(level, logging.INFO), message)
+
+def report_llm_failure(reason: str, message: str):
+    """
+    Surface an LLM failure in the UI, the logs and the failure counters
+    """
+    metrics.increment('llm_failures_total', reason=reason)
+    logger.warning("LLM analysis failed (%s): %s", reason, message)
+    show_message('error', message)
+
+def analyze_resume_with_llm(resume_text: str, target_job: str, use_cache: bool = True,
+                            extracted: Optional[Dict] = None) -> Dict:
+    """
+    Send resume and job target to LLM for analysis.
+    Successful analyses are cached, so identical requests skip the API call.
+    Pass the extract_* results as extracted to avoid recomputing them for the prompt digest.
+    """
+    # Check if API key is configured
+    if not config.validate_config():
+        # If no API key, return simulated response
+        analysis = {
+            "strengths": ["Strong technical background in Python and data science", 
+                          "Relevant experience in machine learning projects", 
+                          "Good academic background from reputable institution"],
+            "improvements": ["Add more specific metrics to quantify achievements",
+                             "Include more technical keywords related to target role",
+                             "Improve formatting for better readability"],
+            "missing_skills": ["Cloud platforms (AWS/Azure)", "Containerization (Docker/Kubernetes)", "CI/CD pipelines"],
+            "wording_suggestions": ["Replace 'responsible for' with action verbs like 'developed', 'implemented', 'led'",
+                                    "Quantify achievements with specific numbers and percentages",
+                                    "Use industry-specific keywords that match job descriptions"]
+        }
+        return analysis
+    
+    cache_key = LLMCache.make_key(resume_text, target_job, PROMPT_VERSION)
+    if use_cache:
+        cached = llm_cache.get(cache_key)
+        if cached is not None:
+            return cached
+    
+    try:
+        # Create the prompt for the LLM
+        prompt = build_analysis_prompt(prepare_resume_for_prompt(resume_text, extracted), target_job)
+        
+        # Use OpenRouter API through the shared, pooled client
+        try:
+            response_json = llm_client.chat_completion(build_llm_payload(prompt))
+        except LLMError as e:
+            report_llm_failure('api_error', f"{str(e)}: {e.body}" if e.body else str(e))
+            return fallback_analysis()
+        
+        # Check if the response has the expected structure
+        if 'choices' not in response_json:
+            report_llm_failure('unexpected_response', f"Unexpected API response format: {response_json}")
+            return fallback_analysis()
+        
+        if not response_json['choices']:
+            report_llm_failure('no_choices', "No choices returned in API response")
+            return fallback_analysis()
+        
+        content = response_json['choices'][0]['message']['content']
+        analysis = json.loads(content)
+        if use_cache:
+            llm_cache.set(cache_key, analysis)
+        return analysis
+        
+    except json.JSONDecodeError:
+        metrics.increment('llm_json_parse_failures_total')
+        report_llm_failure('invalid_json', "Error: LLM response is not in valid JSON format")
+        return fallback_analysis()
+    except Exception as e:
+        report_llm_failure('error', f"Error in LLM analysis: {str(e)}")
+        # Return a default response if there's an error
+        return fallback_analysis()
+
+def analyze_resume_with_llm_stream(resume_text: str, target_job: str, on_item: Callable[[str, str], None],
+                                   use_cache: bool = True, extracted: Optional[Dict] = None,
+                                   should_stop: Optional[Callable[[], bool]] = None) -> Dict:
+    """
+    Stream the LLM analysis, calling on_item(key, item) for each suggestion as it arrives.
+    If the stream breaks, the suggestions received so far are kept and returned.
+    If should_stop() turns true, the stream is closed and the partial (uncached) result returned.
+    """
+    if not config.validate_config():
+        analysis = analyze_resume_with_llm(resume_text, target_job)
+        for key, items in analysis.items():
+            for item in items:
+                on_item(key, item)
+        return analysis
+    
+    cache_key = LLMCache.make_key(resume_text, target_job, PROMPT_VERSION)
+    if use_cache:
+        cached = llm_cache.get(cache_key)
+        if cached is not None:
+            for key, items in cached.items():
+                for item in items:
+                    on_item(key, item)
+            return cached
+    
+    parser = StreamingAnalysisParser()
+    content = []
+    try:
+        prompt = build_analysis_prompt(prepare_resume_for_prompt(resume_text, extracted), target_job)
+        payload = build_llm_payload(prompt)
+        with metrics.timer('llm_stream'):
+            for delta in llm_client.stream_chat_completion(payload):
+                if should_stop is not None and should_stop():
+                    # Leaving the loop closes the generator and with it the HTTP stream
+                    return {key: parser.result.get(key, []) for key, _ in SUGGESTION_SECTIONS}
+                content.append(delta)
+                for key, item in parser.feed(delta):
+                    on_item(key, item)
+    except LLMError as e:
+        if not any(parser.result.values()):
+            report_llm_failure('api_error', f"{str(e)}: {e.body}" if e.body else str(e))
+            return fallback_analysis()
+        metrics.increment('llm_failures_total', reason='stream_cut_off')
+        logger.warning("LLM stream cut off after partial results: %s", e)
+        show_message('warning', "The AI response was cut off. Showing the suggestions received so far.")
+        return {key: parser.result.get(key, []) for key, _ in SUGGESTION_SECTIONS}
+    except Exception as e:
+        report_llm_failure('error', f"Error in LLM analysis: {str(e)}")
+        if not any(parser.result.values()):
+            return fallback_analysis()
+        return {key: parser.result.get(key, []) for key, _ in SUGGESTION_SECTIONS}
+    
+    try:
+        analysis = json.loads(''.join(content))
+    except json.JSONDecodeError:
+        metrics.increment('llm_json_parse_failures_total')
+        if not parser.complete:
+            report_llm_failure('invalid_json', "Error: LLM response is not in valid JSON format")
+            return {key: parser.result.get(key, []) for key, _ in SUGGESTION_SECTIONS} if any(parser.result.values()) else fallback_analysis()
+        # e.g. the JSON object was wrapped in a code fence
+        analysis = parser.result
+    
+    if use_cache:
+        llm_cache.set(cache_key, analysis)
+    return analysis
+
+def _analyze_role_group(resume_for_prompt: str, target_jobs: List[str]) -> Dict[str, Dict]:
+    """
+    One multi-role LLM call. Returns the analyses the model gave, keyed by the requested role names.
+    """
+    payload = build_llm_payload(build_multi_role_prompt(resume_for_prompt, target_jobs),
+                                max_tokens=config.MAX_TOKENS * len(target_jobs))
+    try:
+        response_json = llm_client.chat_completion(payload)
+        roles = json.loads(response_json['choices'][0]['message']['content'])['roles']
+        by_name = {str(name).strip().lower(): analysis for name, analysis in roles.items() if isinstance(analysis, dict)}
+    except LLMError as e:
+        report_llm_failure('api_error', f"{str(e)}: {e.body}" if e.body else str(e))
+        return {}
+    except json.JSONDecodeError:
+        metrics.increment('llm_json_parse_failures_total')
+        report_llm_failure('invalid_json', "Error: LLM response is not in valid JSON format")
+        return {}
+    except (KeyError, IndexError, TypeError, AttributeError):
+        report_llm_failure('unexpected_response', "Unexpected API response format for the multi-role analysis")
+        return {}
+    return {target_job: by_name[target_job.lower()] for target_job in target_jobs if target_job.lower() in by_name}
+
+def analyze_resume_for_roles(resume_text: str, target_jobs: List[str], use_cache: bool = True,
+                             extracted: Optional[Dict] = None) -> Dict[str, Dict]:
+    """
+    Analyze one resume against several target job roles, sending the resume once per
+    MAX_ROLES_PER_CALL roles instead of once per role. Returns an analysis per role
+    (the analyze_resume_with_llm keys plus fit_score), in the order given.
+    Roles already cached for this resume are not sent again.
+    """
+    # Drop blanks and repeats (role names are compared case-insensitively)
+    unique_jobs: Dict[str, str] = {}
+    for target_job in target_jobs:
+        if target_job.strip():
+            unique_jobs.setdefault(target_job.strip().lower(), target_job.strip())
+    target_jobs = list(unique_jobs.values())
+    if not config.validate_config():
+        return {target_job: analyze_resume_with_llm(resume_text, target_job) for target_job in target_jobs}
+    
+    cache_keys = {target_job: LLMCache.make_key(resume_text, target_job, MULTI_ROLE_PROMPT_VERSION)
+                  for target_job in target_jobs}
+    analyses: Dict[str, Dict] = {}
+    if use_cache:
+        for target_job in target_jobs:
+            cached = llm_cache.get(cache_keys[target_job])
+            if cached is not None:
+                analyses[target_job] = cached
+    
+    pending = [target_job for target_job in target_jobs if target_job not in analyses]
+    if pending:
+        resume_for_prompt = prepare_resume_for_prompt(resume_text, extracted)
+        for start in range(0, len(pending), config.MAX_ROLES_PER_CALL):
+            group = pending[start:start + config.MAX_ROLES_PER_CALL]
+            results = _analyze_role_group(resume_for_prompt, group)
+            for target_job in group:
+                if target_job in results:
+                    analyses[target_job] = results[target_job]
+                    if use_cache:
+                        llm_cache.set(cache_keys[target_job], results[target_job])
+                else:
+                    metrics.increment('llm_failures_total', reason='missing_role')
+                    logger.warning("Multi-role analysis returned nothing for %r", target_job)
+                    analyses[target_job] = fallback_analysis()
+    
+    return {target_job: analyses[target_job] for target_job in target_jobs}
+
+def analyze_resume_revision(resume_text: str, target_job: str, previous_analysis: Dict,
+                            changes: List[Tuple[str, str]], use_cache: bool = True) -> Optional[Dict]:
+    """
+    Update the analysis of an earlier revision of the resume by sending the LLM only the
+    changed sections and the previous analysis, instead of the whole resume.
+    Returns None if the update fails, so the caller can run a full analysis instead.
+    An unchanged resume reuses the previous analysis only when use_cache is set.
+    """
+    if not changes:
+        if not use_cache:
+            return None
+        metrics.increment('incremental_analyses_total', result='unchanged')
+        return previous_analysis
+    if not config.validate_config():
+        return None
+    
+    cache_key = LLMCache.make_key(resume_text, target_job, REVISION_PROMPT_VERSION)
+    if use_cache:
+        cached = llm_cache.get(cache_key)
+        if cached is not None:
+            return cached
+    
+    payload = build_llm_payload(build_revision_prompt(previous_analysis, changes, target_job))
+    try:
+        response_json = llm_client.chat_completion(payload)
+        analysis = json.loads(response_json['choices'][0]['message']['content'])
+        if not isinstance(analysis, dict):
+            raise TypeError(f"expected a JSON object, got {type(analysis).__name__}")
+    except (LLMError, ValueError, KeyError, IndexError, TypeError) as e:
+        metrics.increment('incremental_analyses_total', result='failed')
+        logger.warning("Incremental analysis failed, running a full analysis instead: %s", e)
+        return None
+    
+    metrics.increment('incremental_analyses_total', result='updated')
+    if use_cache:
+        llm_cache.set(cache_key, analysis)
+    return analysis
+
+async def analyze_many(jobs: List[Tuple[str, str]], max_concurrency: Optional[int] = None,
+                       use_cache: bool = True) -> List[Dict]:
+    """
+    Analyze many (resume_text, target_job) pairs concurrently.
+    At most max_concurrency LLM calls are in flight at once; results keep the input order.
+    """
+    import asyncio
+    semaphore = asyncio.Semaphore(max_concurrency or config.LLM_MAX_CONCURRENCY)
+    
+    async def analyze_one(resume_text: str, target_job: str) -> Dict:
+        async with semaphore:
+            return await asyncio.to_thread(analyze_resume_with_llm, resume_text, target_job, use_cache)
+    
+    return await asyncio.gather(*(analyze_one(resume_text, target_job) for resume_text, target_job in jobs))
+
+def run_analysis_job(job: 'Job', resume_text: str, target_jobs: List[str], use_cache: bool, extracted: Dict,
+                     stream: bool, trace: Optional[RequestTrace] = None, previous_analysis: Optional[Dict] = None,
+                     changes: Optional[List[Tuple[str, str]]] = None) -> Dict:
+    """
+    Background job body: run the LLM analysis, publishing streamed suggestions to job.partial.
+    Several target jobs are analyzed together in one multi-role call (not streamed).
+    Given the previous revision's analysis and the changed sections, a single role is
+    first updated incrementally (see analyze_resume_revision).
+    Returns the analysis of the first role, every role's analysis, whether it was an
+    incremental update, and any messages that would have been shown.
+    """
+    messages: List[Tuple[str, str]] = []
+    token = _message_sink.set(messages)
+    target_job = target_jobs[0]
+    role_analyses = None
+    analysis = None
+    try:
+        with trace_if(trace is not None, trace):
+            if previous_analysis is not None and changes is not None and len(target_jobs) == 1:
+                analysis = analyze_resume_revision(resume_text, target_job, previous_analysis, changes,
+                                                   use_cache=use_cache)
+            incremental = analysis is not None
+            if analysis is None and len(target_jobs) > 1:
+                role_analyses = analyze_resume_for_roles(resume_text, target_jobs, use_cache=use_cache,
+                                                         extracted=extracted)
+                analysis = role_analyses[target_job]
+            elif analysis is None and stream:
+                def publish(key: str, item: str):
+                    job.partial.setdefault(key, []).append(item)
+                
+                analysis = analyze_resume_with_llm_stream(resume_text, target_job, publish, use_cache=use_cache,
+                                                          extracted=extracted, should_stop=lambda: job.cancel_requested)
+            elif analysis is None:
+                analysis = analyze_resume_with_llm(resume_text, target_job, use_cache=use_cache, extracted=extracted)
+    finally:
+        _message_sink.reset(token)
+    return {'analysis': analysis, 'role_analyses': role_analyses, 'incremental': incremental, 'messages': messages}
+
+def trace_if(enabled: bool, trace: Optional[RequestTrace]):
+    """
+    Record stage timings and counters into trace when enabled, otherwise do nothing
+    """
+    return metrics.trace_request(trace) if enabled and trace is not None else nullcontext()
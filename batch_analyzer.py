@@ -0,0 +1,263 @@
+"""
+Headless batch mode for screening many resumes at once.
+
+Usage:
+    python batch_analyzer.py resumes/ --job "Data Scientist" --output results.jsonl
+    python batch_analyzer.py manifest.txt --job "Data Scientist" --output results.csv --llm
+"""
+import argparse
+import csv
+import json
+import os
+import sys
+import time
+from concurrent.futures import FIRST_COMPLETED, Future, ProcessPoolExecutor, wait
+from typing import Dict, Iterable, Iterator, List, Optional, Set
+
+SUPPORTED_EXTENSIONS = ('.pdf', '.txt')
+# Results added to the candidate index per transaction
+INDEX_BATCH_SIZE = 500
+CSV_FIELDS = ['path', 'target_job', 'skills', 'education', 'work_experience', 'analysis', 'error', 'elapsed']
+
+
+def iter_resume_paths(source: str) -> Iterator[str]:
+    """
+    Yield resume paths from a directory (searched recursively) or a manifest file
+    with one path per line. Relative manifest entries resolve against the manifest.
+    """
+    if os.path.isdir(source):
+        for root, dirs, files in os.walk(source):
+            dirs.sort()
+            for name in sorted(files):
+                if name.lower().endswith(SUPPORTED_EXTENSIONS):
+                    yield os.path.join(root, name)
+        return
+
+    base_dir = os.path.dirname(os.path.abspath(source))
+    with open(source, encoding='utf-8') as manifest:
+        for line in manifest:
+            line = line.strip()
+            if line and not line.startswith('#'):
+                yield line if os.path.isabs(line) else os.path.join(base_dir, line)
+
+
+def read_resume_text(path: str) -> str:
+    """
+    Read resume text from a PDF or plain text file
+    """
+    from pdf_extractor import extract_pdf_text
+
+    if path.lower().endswith('.pdf'):
+        with open(path, 'rb') as pdf_file:
+            # The batch already runs one process per core, so pages are not fanned out again
+            return extract_pdf_text(pdf_file.read(), workers=1)
+    with open(path, encoding='utf-8', errors='replace') as text_file:
+        return text_file.read()
+
+
+def analyze_file(path: str, target_job: str, use_llm: bool = False) -> Dict:
+    """
+    Run the extraction pipeline (and optionally the LLM analysis) for one resume.
+    Runs inside a worker process, so errors are returned rather than raised.
+    """
+    from analyzer_core import analyze_resume_with_llm, extract_education, extract_skills, extract_work_experience
+    from section_segmenter import segment_resume
+
+    started = time.perf_counter()
+    result = {'path': path, 'target_job': target_job, 'skills': [], 'education': [],
+              'work_experience': [], 'analysis': None, 'error': None}
+    try:
+        resume_text = read_resume_text(path)
+        if not resume_text.strip():
+            result['error'] = "No text could be extracted"
+        else:
+            sections = segment_resume(resume_text)
+            result['skills'] = sorted(extract_skills(resume_text, sections))
+            result['education'] = sorted(extract_education(resume_text, sections))
+            result['work_experience'] = sorted(extract_work_experience(resume_text, sections))
+            if use_llm:
+                extracted = {key: result[key] for key in ('skills', 'education', 'work_experience')}
+                result['analysis'] = analyze_resume_with_llm(resume_text, target_job, extracted=extracted)
+    except Exception as e:
+        result['error'] = f"{type(e).__name__}: {str(e)}"
+    result['elapsed'] = round(time.perf_counter() - started, 4)
+    return result
+
+
+def _truncate_partial_record(path: str, csv_format: bool):
+    """
+    Cut a record left half-written by a crash off the end of an output file, so the
+    next record appended does not get glued onto it
+    """
+    with open(path, 'rb+') as f:
+        data = f.read()
+        if csv_format:
+            # Quoted fields may contain newlines, so a record only ends at a \r\n
+            # preceded by an even number of quote characters
+            end = data.rfind(b'\r\n')
+            while end != -1 and data.count(b'"', 0, end) % 2:
+                end = data.rfind(b'\r\n', 0, end)
+            end = end + 2 if end != -1 else 0
+        else:
+            end = data.rfind(b'\n') + 1
+        if end < len(data):
+            f.truncate(end)
+
+
+class ResultWriter:
+    """
+    Append results to a JSONL or CSV file, flushing after every record so a crashed
+    run can be resumed from whatever made it to disk.
+    """
+
+    def __init__(self, output_path: str, output_format: Optional[str] = None):
+        self.output_path = output_path
+        self.format = output_format or ('csv' if output_path.lower().endswith('.csv') else 'jsonl')
+        if os.path.exists(output_path):
+            _truncate_partial_record(output_path, self.format == 'csv')
+        is_new = not os.path.exists(output_path) or os.path.getsize(output_path) == 0
+        self._file = open(output_path, 'a', encoding='utf-8', newline='')
+        self._csv_writer = None
+        if self.format == 'csv':
+            self._csv_writer = csv.DictWriter(self._file, fieldnames=CSV_FIELDS)
+            if is_new:
+                self._csv_writer.writeheader()
+
+    def completed_paths(self) -> Set[str]:
+        """
+        Return the resume paths already present in the output file
+        """
+        done = set()
+        with open(self.output_path, encoding='utf-8', newline='') as f:
+            if self.format == 'csv':
+                for row in csv.DictReader(f):
+                    done.add(row['path'])
+            else:
+                for line in f:
+                    try:
+                        done.add(json.loads(line)['path'])
+                    except (json.JSONDecodeError, KeyError):
+                        # Not a result line (e.g. a corrupted file); that resume is redone
+                        continue
+        return done
+
+    def write(self, result: Dict):
+        if self._csv_writer is not None:
+            row = dict(result)
+            for key in ('skills', 'education', 'work_experience'):
+                row[key] = '; '.join(row[key])
+            row['analysis'] = json.dumps(row['analysis']) if row['analysis'] is not None else ''
+            self._csv_writer.writerow(row)
+        else:
+            self._file.write(json.dumps(result) + '\n')
+        self._file.flush()
+
+    def close(self):
+        self._file.close()
+
+
+def run_batch(paths: Iterable[str], target_job: str, writer: ResultWriter, workers: Optional[int] = None,
+              max_in_flight: Optional[int] = None, use_llm: bool = False, total: Optional[int] = None,
+              progress=None, index=None) -> Dict[str, int]:
+    """
+    Fan resumes out over a process pool, keeping at most max_in_flight submitted at once
+    so memory stays flat regardless of batch size. Results are written as they finish,
+    and successful ones are also added to index (a CandidateIndex) in bulk if given.
+    Those are only written once their batch is in the index, so a resumed run never
+    skips a resume that was not indexed.
+    """
+    workers = workers or os.cpu_count() or 1
+    max_in_flight = max_in_flight or workers * 4
+    stats = {'processed': 0, 'failed': 0}
+    started = time.perf_counter()
+    to_index: List[Dict] = []
+
+    def flush_index():
+        index.add_many(to_index)
+        for result in to_index:
+            writer.write(result)
+        to_index.clear()
+
+    def collect(done_futures: Set[Future]):
+        for future in done_futures:
+            result = future.result()
+            stats['processed'] += 1
+            if result['error']:
+                stats['failed'] += 1
+            if index is None or result['error']:
+                writer.write(result)
+            else:
+                to_index.append(result)
+                if len(to_index) >= INDEX_BATCH_SIZE:
+                    flush_index()
+            if progress:
+                progress(stats['processed'], total, result, time.perf_counter() - started)
+
+    with ProcessPoolExecutor(max_workers=workers) as executor:
+        in_flight: Set[Future] = set()
+        for path in paths:
+            if len(in_flight) >= max_in_flight:
+                done, in_flight = wait(in_flight, return_when=FIRST_COMPLETED)
+                collect(done)
+            in_flight.add(executor.submit(analyze_file, path, target_job, use_llm))
+        while in_flight:
+            done, in_flight = wait(in_flight, return_when=FIRST_COMPLETED)
+            collect(done)
+
+    if to_index:
+        flush_index()
+
+    return stats
+
+
+def print_progress(processed: int, total: Optional[int], result: Dict, elapsed: float):
+    rate = processed / elapsed if elapsed > 0 else 0.0
+    status = f"error: {result['error']}" if result['error'] else "ok"
+    count = f"{processed}/{total}" if total is not None else str(processed)
+    print(f"[{count}] {result['path']} - {status} ({rate:.1f} resumes/s)", file=sys.stderr)
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description="Analyze a batch of resumes without the Streamlit UI")
+    parser.add_argument('source', help="Directory of PDF/text resumes, or a manifest file with one path per line")
+    parser.add_argument('--job', required=True, help="Target job role")
+    parser.add_argument('--output', required=True, help="Output file (.jsonl or .csv)")
+    parser.add_argument('--format', choices=('jsonl', 'csv'), help="Output format (default: from the file extension)")
+    parser.add_argument('--workers', type=int, help="Worker processes (default: number of CPU cores)")
+    parser.add_argument('--max-in-flight', type=int, help="Maximum resumes queued at once (default: 4 per worker)")
+    parser.add_argument('--llm', action='store_true', help="Also run the LLM analysis for each resume")
+    parser.add_argument('--index', nargs='?', const='', metavar='PATH',
+                        help="Also add results to the candidate index (default path: CANDIDATE_INDEX_PATH)")
+    parser.add_argument('--restart', action='store_true', help="Ignore existing output instead of resuming")
+    parser.add_argument('--quiet', action='store_true', help="Do not print per-resume progress")
+    args = parser.parse_args(argv)
+
+    if args.restart and os.path.exists(args.output):
+        os.remove(args.output)
+
+    index = None
+    if args.index is not None:
+        from candidate_index import CandidateIndex
+        from config import config
+
+        index = CandidateIndex(args.index or config.CANDIDATE_INDEX_PATH)
+
+    writer = ResultWriter(args.output, args.format)
+    try:
+        completed = writer.completed_paths()
+        paths = [path for path in iter_resume_paths(args.source) if path not in completed]
+        if completed:
+            print(f"Resuming: skipping {len(completed)} already processed resumes", file=sys.stderr)
+
+        stats = run_batch(paths, args.job, writer, workers=args.workers, max_in_flight=args.max_in_flight,
+                          use_llm=args.llm, total=len(paths), progress=None if args.quiet else print_progress,
+                          index=index)
+    finally:
+        writer.close()
+
+    print(f"Processed {stats['processed']} resumes ({stats['failed']} failed) -> {args.output}", file=sys.stderr)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,59 @@
+"""
+Regression benchmark: worst-case extraction time must grow linearly with text length.
+
+Runs extract_skills, extract_education and extract_work_experience over adversarial
+inputs that used to trigger catastrophic regex backtracking, doubling the input size
+each step. Exits non-zero if any input grows clearly faster than linear.
+
+Usage:
+    python benchmarks/bench_extractors.py
+"""
+import os
+import sys
+import time
+from typing import List
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from analyzer_core import extract_education, extract_skills, extract_work_experience  # noqa: E402
+from section_segmenter import segment_resume  # noqa: E402
+from corpus import PATHOLOGICAL_INPUTS  # noqa: E402
+
+SIZES = [2000, 4000, 8000, 16000, 32000]
+# Allowed slowdown on top of the size ratio before the run is considered super-linear
+TOLERANCE = 3.0
+REPEATS = 3
+
+
+def time_extraction(text: str) -> float:
+    best = float('inf')
+    for _ in range(REPEATS):
+        started = time.perf_counter()
+        sections = segment_resume(text)
+        extract_skills(text, sections)
+        extract_education(text, sections)
+        extract_work_experience(text, sections)
+        best = min(best, time.perf_counter() - started)
+    return best
+
+
+def main() -> int:
+    failures: List[str] = []
+    for name, make_input in PATHOLOGICAL_INPUTS.items():
+        timings = [time_extraction(make_input(size)) for size in SIZES]
+        size_ratio = SIZES[-1] / SIZES[0]
+        time_ratio = timings[-1] / max(timings[0], 1e-6)
+        row = "  ".join(f"{size}: {elapsed * 1000:7.1f}ms" for size, elapsed in zip(SIZES, timings))
+        print(f"{name:26s} {row}  (x{time_ratio:.1f} for x{size_ratio:.0f} input)")
+        if time_ratio > size_ratio * TOLERANCE:
+            failures.append(name)
+
+    if failures:
+        print(f"FAIL: super-linear extraction time for {', '.join(failures)}")
+        return 1
+    print("OK: extraction time is linear in input length")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
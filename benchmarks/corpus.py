@@ -0,0 +1,140 @@
+"""
+Synthetic resume corpus for benchmarks: plain text resumes of configurable length and
+layout, pathological inputs for the extractors, and a dependency-free PDF writer.
+"""
+import random
+from typing import Callable, Dict, List, Optional
+
+FIRST_NAMES = ['Jane', 'John', 'Priya', 'Wei', 'Carlos', 'Amara', 'Lukas', 'Sofia', 'Omar', 'Yuki']
+LAST_NAMES = ['Doe', 'Smith', 'Sharma', 'Chen', 'Garcia', 'Okafor', 'Muller', 'Rossi', 'Haddad', 'Tanaka']
+COMPANIES = ['Acme Inc', 'Globex Corp', 'Initech LLC', 'Umbrella Group', 'Stark Industries Ltd',
+             'Wayne Enterprises Inc', 'Hooli Corp', 'Vandelay Industries LLC']
+TITLES = ['Software Engineer', 'Senior Data Scientist', 'Product Manager', 'DevOps Engineer',
+          'Machine Learning Engineer', 'Backend Developer', 'Data Analyst', 'Engineering Manager']
+DEGREES = ['Bachelor of Science in Computer Science', 'Master of Science in Data Science',
+           'Bachelor of Engineering in Electronics', 'MBA in Technology Management', 'PhD in Physics']
+SCHOOLS = ['Stanford University', 'Delhi Institute of Technology', 'Boston College',
+           'University of Toronto', 'Imperial College', 'Tokyo Institute of Technology']
+SKILLS = ['Python', 'Java', 'SQL', 'Docker', 'Kubernetes', 'AWS', 'React', 'TensorFlow', 'PyTorch',
+          'PostgreSQL', 'Git', 'Linux', 'Machine Learning', 'Data Analysis', 'Leadership', 'Agile', 'Go',
+          'TypeScript', 'Node.js', 'CI/CD', 'Spark', 'Airflow', 'Terraform']
+VERBS = ['Built', 'Designed', 'Led', 'Scaled', 'Migrated', 'Automated', 'Optimized', 'Launched']
+OBJECTS = ['a data pipeline', 'the billing service', 'an internal API', 'the recommendation model',
+           'CI/CD for 40 services', 'a React dashboard', 'the search index', 'on-call tooling']
+OUTCOMES = ['cutting latency by 35%', 'saving $200k a year', 'serving 2M daily users',
+            'reducing incidents by half', 'with 99.95% uptime', 'for 12 teams']
+
+LAYOUTS = ('standard', 'compact', 'no_headings')
+
+
+def _bullet(rng: random.Random) -> str:
+    return f"- {rng.choice(VERBS)} {rng.choice(OBJECTS)}, {rng.choice(OUTCOMES)}"
+
+
+def generate_resume(rng: random.Random, jobs: int = 3, bullets_per_job: int = 4, layout: str = 'standard',
+                    publications: int = 0) -> str:
+    """
+    Generate a plausible resume. More jobs, bullets and publications make it longer;
+    layout controls the headings ('standard', 'compact' inline headings, or 'no_headings').
+    """
+    if layout not in LAYOUTS:
+        raise ValueError(f"Unknown layout {layout!r}, expected one of {', '.join(LAYOUTS)}")
+
+    def heading(title: str) -> str:
+        if layout == 'standard':
+            return f"\n{title.upper()}\n"
+        if layout == 'compact':
+            return f"\n{title}:"
+        return "\n"
+
+    name = f"{rng.choice(FIRST_NAMES)} {rng.choice(LAST_NAMES)}"
+    lines = [name, f"{name.split()[0].lower()}@example.com | +1 555 0100"]
+    lines.append(heading("Summary"))
+    lines.append(f"{rng.choice(TITLES)} with {rng.randint(2, 15)} years of experience in "
+                 f"{rng.choice(SKILLS)} and {rng.choice(SKILLS)}.")
+    lines.append(heading("Skills"))
+    lines.append(", ".join(rng.sample(SKILLS, rng.randint(6, 12))))
+    lines.append(heading("Work Experience"))
+    for _ in range(jobs):
+        start = rng.randint(2005, 2020)
+        lines.append(f"{rng.choice(TITLES)} at {rng.choice(COMPANIES)}")
+        lines.append(f"{start} - {start + rng.randint(1, 4)}")
+        lines.extend(_bullet(rng) for _ in range(bullets_per_job))
+        lines.append("")
+    lines.append(heading("Education"))
+    for _ in range(rng.randint(1, 2)):
+        lines.append(f"{rng.choice(DEGREES)} at {rng.choice(SCHOOLS)}")
+    if publications:
+        lines.append(heading("Publications"))
+        for i in range(publications):
+            lines.append(f"[{i + 1}] {rng.choice(LAST_NAMES)} et al. On {rng.choice(OBJECTS)}. "
+                         f"Proc. Conf. {rng.randint(2010, 2024)}, pp. {rng.randint(1, 400)}-{rng.randint(401, 800)}.")
+    return "\n".join(lines) + "\n"
+
+
+def generate_corpus(count: int, seed: int = 0, jobs: int = 3, bullets_per_job: int = 4,
+                    layout: Optional[str] = None, publications: int = 0) -> List[str]:
+    """
+    Generate count resumes; layout=None mixes all layouts
+    """
+    rng = random.Random(seed)
+    return [generate_resume(rng, jobs=jobs, bullets_per_job=bullets_per_job,
+                            layout=layout or rng.choice(LAYOUTS), publications=publications)
+            for _ in range(count)]
+
+
+# Inputs that used to trigger catastrophic regex backtracking in the extractors
+PATHOLOGICAL_INPUTS: Dict[str, Callable[[int], str]] = {
+    # A section that never reaches a '-' or ',' followed by a title
+    'experience_no_separator': lambda n: "Work Experience:\n" + ("Abc def " * n)[:n],
+    # Long run of comma separated capitalised words
+    'experience_commas': lambda n: "Experience:\n" + ("Acme, " * n)[:n],
+    # Title-case words that the degree pattern can split many ways
+    'education_title_words': lambda n: "Education:\n" + ("Bachelor Science Engineering " * n)[:n],
+    # One enormous 'word'
+    'education_single_word': lambda n: "Education:\nB" + "a" * n,
+    # Repeated 'at' phrases with no company suffix
+    'job_at_chain': lambda n: ("Senior Engineer at " * n)[:n],
+    # No headings and no blank lines at all
+    'no_sections': lambda n: ("Lorem Ipsum Dolor Sit Amet " * n)[:n],
+}
+
+
+def _pdf_escape(line: str) -> str:
+    line = line.encode('latin-1', errors='replace').decode('latin-1')
+    return line.replace('\\', '\\\\').replace('(', '\\(').replace(')', '\\)')
+
+
+def text_to_pdf(text: str, lines_per_page: int = 50) -> bytes:
+    """
+    Render plain text into a minimal multi-page PDF (Helvetica, one text line per line)
+    """
+    lines = text.splitlines() or ['']
+    pages = [lines[i:i + lines_per_page] for i in range(0, len(lines), lines_per_page)]
+
+    objects: List[bytes] = []
+    # 1: catalog, 2: page tree, 3: font, then a page object and content stream per page
+    page_ids = [4 + 2 * i for i in range(len(pages))]
+    objects.append(b"<< /Type /Catalog /Pages 2 0 R >>")
+    kids = " ".join(f"{page_id} 0 R" for page_id in page_ids)
+    objects.append(f"<< /Type /Pages /Kids [{kids}] /Count {len(pages)} >>".encode())
+    objects.append(b"<< /Type /Font /Subtype /Type1 /BaseFont /Helvetica >>")
+    for page_id, page_lines in zip(page_ids, pages):
+        content = ["BT", "/F1 10 Tf", "12 TL", "50 780 Td"]
+        content.extend(f"({_pdf_escape(line)}) Tj T*" for line in page_lines)
+        content.append("ET")
+        stream = "\n".join(content).encode('latin-1')
+        objects.append(f"<< /Type /Page /Parent 2 0 R /MediaBox [0 0 612 842] "
+                       f"/Resources << /Font << /F1 3 0 R >> >> /Contents {page_id + 1} 0 R >>".encode())
+        objects.append(b"<< /Length " + str(len(stream)).encode() + b" >>\nstream\n" + stream + b"\nendstream")
+
+    out = bytearray(b"%PDF-1.4\n")
+    offsets = []
+    for number, body in enumerate(objects, start=1):
+        offsets.append(len(out))
+        out += f"{number} 0 obj\n".encode() + body + b"\nendobj\n"
+    xref_offset = len(out)
+    out += f"xref\n0 {len(objects) + 1}\n0000000000 65535 f \n".encode()
+    out += b"".join(f"{offset:010d} 00000 n \n".encode() for offset in offsets)
+    out += f"trailer\n<< /Size {len(objects) + 1} /Root 1 0 R >>\nstartxref\n{xref_offset}\n%%EOF\n".encode()
+    return bytes(out)
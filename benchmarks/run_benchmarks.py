@@ -0,0 +1,198 @@
+"""
+Offline benchmark harness for the extraction and analysis pipeline.
+
+Generates a synthetic corpus (text and PDF), runs each stage against it, and reports
+throughput, p50/p95/p99 latency and peak memory per stage. The LLM round-trip runs
+against a local stub server with configurable latency. Results can be saved and
+compared against a stored baseline, in which case regressions fail the run.
+
+Usage:
+    python benchmarks/run_benchmarks.py --output bench.json --save-baseline baseline.json
+    python benchmarks/run_benchmarks.py --baseline baseline.json
+"""
+import argparse
+import json
+import math
+import os
+import platform
+import random
+import sys
+import time
+import tracemalloc
+from typing import Callable, Dict, List, Sequence
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from corpus import PATHOLOGICAL_INPUTS, generate_corpus, text_to_pdf  # noqa: E402
+from stub_llm_server import StubLLMServer  # noqa: E402
+
+# Items per stage that are re-run under tracemalloc to measure peak memory
+MEMORY_SAMPLE = 20
+
+
+def percentile(sorted_values: Sequence[float], fraction: float) -> float:
+    if not sorted_values:
+        return 0.0
+    # Nearest-rank percentile
+    index = min(len(sorted_values) - 1, max(0, math.ceil(fraction * len(sorted_values)) - 1))
+    return sorted_values[index]
+
+
+def measure(fn: Callable, items: Sequence) -> Dict:
+    """
+    Time fn over every item, then re-run a sample under tracemalloc for peak memory
+    """
+    latencies: List[float] = []
+    started = time.perf_counter()
+    for item in items:
+        call_started = time.perf_counter()
+        fn(item)
+        latencies.append(time.perf_counter() - call_started)
+    total = time.perf_counter() - started
+
+    tracemalloc.start()
+    peak = 0
+    for item in items[:MEMORY_SAMPLE]:
+        tracemalloc.reset_peak()
+        baseline, _ = tracemalloc.get_traced_memory()
+        fn(item)
+        peak = max(peak, tracemalloc.get_traced_memory()[1] - baseline)
+    tracemalloc.stop()
+
+    latencies.sort()
+    return {
+        'count': len(items),
+        'total_s': round(total, 4),
+        'throughput_per_s': round(len(items) / total, 2) if total else 0.0,
+        'p50_ms': round(percentile(latencies, 0.50) * 1000, 3),
+        'p95_ms': round(percentile(latencies, 0.95) * 1000, 3),
+        'p99_ms': round(percentile(latencies, 0.99) * 1000, 3),
+        'peak_memory_kb': round(peak / 1024, 1),
+    }
+
+
+def run(args) -> Dict:
+    from pdf_extractor import clear_extraction_cache, extract_pdf_text
+    from analyzer_core import analyze_resume_with_llm, extract_education, extract_skills, extract_work_experience
+    from section_segmenter import segment_resume
+    from llm_client import llm_client
+
+    texts = generate_corpus(args.resumes, seed=args.seed, jobs=args.jobs, publications=args.publications)
+    pdfs = [text_to_pdf(text) for text in texts[:args.pdf_resumes]]
+    segmented = [(text, segment_resume(text)) for text in texts]
+    pathological = [make_input(args.pathological_size) for make_input in PATHOLOGICAL_INPUTS.values()]
+
+    stages = {}
+    print("Running pdf_extraction...", file=sys.stderr)
+
+    def extract_pdf_uncached(data: bytes):
+        clear_extraction_cache()
+        extract_pdf_text(data, workers=1)
+
+    if pdfs:
+        # PyPDF2 is imported on first use; keep that one-off cost out of the latencies
+        extract_pdf_uncached(pdfs[0])
+    stages['pdf_extraction'] = measure(extract_pdf_uncached, pdfs)
+    print("Running extractors...", file=sys.stderr)
+    stages['segment_resume'] = measure(segment_resume, texts)
+    stages['extract_skills'] = measure(lambda item: extract_skills(*item), segmented)
+    stages['extract_education'] = measure(lambda item: extract_education(*item), segmented)
+    stages['extract_work_experience'] = measure(lambda item: extract_work_experience(*item), segmented)
+
+    def extract_all(text: str):
+        sections = segment_resume(text)
+        extract_skills(text, sections)
+        extract_education(text, sections)
+        extract_work_experience(text, sections)
+
+    stages['pathological_extraction'] = measure(extract_all, pathological)
+
+    print("Running llm_roundtrip against the stub server...", file=sys.stderr)
+    rng = random.Random(args.seed)
+    llm_texts = [rng.choice(texts) for _ in range(args.llm_calls)]
+    with StubLLMServer(latency=args.llm_latency) as server:
+        original_url = llm_client.base_url
+        llm_client.base_url = server.url
+        try:
+            stages['llm_roundtrip'] = measure(
+                lambda text: analyze_resume_with_llm(text, "Software Engineer", use_cache=False), llm_texts
+            )
+        finally:
+            llm_client.base_url = original_url
+
+    return {
+        'meta': {
+            'timestamp': time.strftime('%Y-%m-%dT%H:%M:%S'),
+            'python': platform.python_version(),
+            'platform': platform.platform(),
+            'params': {key: value for key, value in vars(args).items()
+                       if key not in ('output', 'baseline', 'save_baseline')},
+        },
+        'stages': stages,
+    }
+
+
+def compare(results: Dict, baseline: Dict, tolerance: float) -> List[str]:
+    """
+    Return a message per stage whose p95 latency or throughput regressed beyond tolerance
+    """
+    regressions = []
+    for stage, before in baseline.get('stages', {}).items():
+        after = results['stages'].get(stage)
+        if after is None:
+            continue
+        if after['p95_ms'] > before['p95_ms'] * (1 + tolerance):
+            regressions.append(f"{stage}: p95 {before['p95_ms']}ms -> {after['p95_ms']}ms")
+        if after['throughput_per_s'] < before['throughput_per_s'] * (1 - tolerance):
+            regressions.append(f"{stage}: throughput {before['throughput_per_s']}/s -> {after['throughput_per_s']}/s")
+    return regressions
+
+
+def print_report(results: Dict):
+    header = f"{'stage':26s} {'count':>6s} {'items/s':>10s} {'p50 ms':>9s} {'p95 ms':>9s} {'p99 ms':>9s} {'peak KB':>9s}"
+    print(header)
+    print('-' * len(header))
+    for stage, row in results['stages'].items():
+        print(f"{stage:26s} {row['count']:6d} {row['throughput_per_s']:10.1f} {row['p50_ms']:9.2f} "
+              f"{row['p95_ms']:9.2f} {row['p99_ms']:9.2f} {row['peak_memory_kb']:9.1f}")
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description="Benchmark the resume analysis pipeline offline")
+    parser.add_argument('--resumes', type=int, default=200, help="Synthetic text resumes to generate")
+    parser.add_argument('--jobs', type=int, default=4, help="Jobs per synthetic resume")
+    parser.add_argument('--publications', type=int, default=0, help="Publication entries per resume (makes them longer)")
+    parser.add_argument('--pdf-resumes', type=int, default=20, help="How many resumes to also render as PDFs")
+    parser.add_argument('--pathological-size', type=int, default=8000, help="Length of each pathological input")
+    parser.add_argument('--llm-calls', type=int, default=20, help="LLM round-trips against the stub server")
+    parser.add_argument('--llm-latency', type=float, default=0.05, help="Stub server latency per response (s)")
+    parser.add_argument('--seed', type=int, default=0)
+    parser.add_argument('--output', help="Write results to this JSON file")
+    parser.add_argument('--baseline', help="Compare against this results file and fail on regressions")
+    parser.add_argument('--save-baseline', help="Also write the results here for future comparisons")
+    parser.add_argument('--tolerance', type=float, default=0.25, help="Allowed relative regression (default 25%%)")
+    args = parser.parse_args(argv)
+
+    results = run(args)
+    print_report(results)
+
+    for path in (args.output, args.save_baseline):
+        if path:
+            with open(path, 'w', encoding='utf-8') as f:
+                json.dump(results, f, indent=2)
+
+    if args.baseline:
+        with open(args.baseline, encoding='utf-8') as f:
+            baseline = json.load(f)
+        regressions = compare(results, baseline, args.tolerance)
+        if regressions:
+            print("\nPERFORMANCE REGRESSION against " + args.baseline)
+            for message in regressions:
+                print("  " + message)
+            return 1
+        print(f"\nNo regressions against {args.baseline} (tolerance {args.tolerance:.0%})")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
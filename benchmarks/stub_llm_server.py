@@ -0,0 +1,179 @@
+"""
+Local stand-in for the OpenRouter chat completions API, for offline benchmarks and tests.
+
+Usage:
+    python benchmarks/stub_llm_server.py --port 8799 --latency 0.5
+    OPENROUTER_BASE_URL=http://127.0.0.1:8799 streamlit run resume_analyzer.py
+"""
+import argparse
+import json
+import random
+import threading
+import time
+from collections import deque
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Deque, Dict, Optional, Tuple
+
+CANNED_ANALYSIS = {
+    "strengths": ["Hands-on experience with the core stack for the role",
+                  "Quantified impact in recent positions"],
+    "improvements": ["Lead each bullet with an outcome",
+                     "Trim older roles to one line each"],
+    "missing_skills": ["Kubernetes", "Terraform"],
+    "wording_suggestions": ["Replace 'responsible for' with an action verb",
+                            "Keep tense consistent within each role"],
+}
+
+
+class StubLLMServer:
+    """
+    Threaded HTTP server answering /chat/completions with a canned analysis.
+
+    latency is the total time per response (spread across chunks when streaming),
+    jitter adds up to that many extra seconds, and error_rate makes that fraction of
+    requests fail with 429 and Retry-After: 0. fail_next queues specific failures
+    for the next requests, for tests.
+    """
+
+    def __init__(self, host: str = '127.0.0.1', port: int = 0, latency: float = 0.0, jitter: float = 0.0,
+                 error_rate: float = 0.0, analysis: Optional[Dict] = None, seed: int = 0):
+        self.latency = latency
+        self.jitter = jitter
+        self.error_rate = error_rate
+        self.analysis = analysis or CANNED_ANALYSIS
+        self.requests = 0
+        self._failures: Deque[Tuple[int, Optional[str]]] = deque()
+        self._random = random.Random(seed)
+        self._lock = threading.Lock()
+        self._server = ThreadingHTTPServer((host, port), self._make_handler())
+        self._server.daemon_threads = True
+        self._thread: Optional[threading.Thread] = None
+
+    def respond(self, payload: Dict) -> Dict:
+        """
+        The analysis for a request: one per role when the prompt lists several target roles
+        """
+        prompt = ''.join(message.get('content', '') for message in payload.get('messages', []))
+        marker = "Target job roles:\n"
+        if marker not in prompt:
+            return self.analysis
+        roles = [line[2:].strip() for line in prompt.split(marker, 1)[1].splitlines() if line.startswith('- ')]
+        return {"roles": {role: dict(self.analysis, fit_score=40 + sum(map(ord, role)) % 56)
+                          for role in roles}}
+
+    def fail_next(self, status: int, retry_after: Optional[str] = None, count: int = 1):
+        """
+        Answer the next count requests with this status (and Retry-After header, if given)
+        """
+        with self._lock:
+            self._failures.extend([(status, retry_after)] * count)
+
+    @property
+    def url(self) -> str:
+        host, port = self._server.server_address[:2]
+        return f"http://{host}:{port}"
+
+    def _make_handler(self):
+        stub = self
+
+        class Handler(BaseHTTPRequestHandler):
+            protocol_version = 'HTTP/1.1'
+
+            def log_message(self, *args):
+                pass
+
+            def _send(self, status: int, body: bytes, content_type: str = 'application/json', headers=None):
+                self.send_response(status)
+                self.send_header('Content-Type', content_type)
+                self.send_header('Content-Length', str(len(body)))
+                for name, value in (headers or {}).items():
+                    self.send_header(name, value)
+                self.end_headers()
+                self.wfile.write(body)
+
+            def do_POST(self):
+                length = int(self.headers.get('Content-Length', 0))
+                payload = json.loads(self.rfile.read(length) or b'{}')
+                with stub._lock:
+                    stub.requests += 1
+                    failure = stub._failures.popleft() if stub._failures else None
+                    fail = stub._random.random() < stub.error_rate
+                    delay = stub.latency + stub._random.random() * stub.jitter
+                if failure is not None:
+                    status, retry_after = failure
+                    headers = {'Retry-After': retry_after} if retry_after is not None else None
+                    self._send(status, json.dumps({"error": {"message": f"stub failure {status}"}}).encode(),
+                               headers=headers)
+                    return
+                if fail:
+                    self._send(429, b'{"error": {"message": "rate limited"}}', headers={'Retry-After': '0'})
+                    return
+
+                content = json.dumps(stub.respond(payload))
+                if not payload.get('stream'):
+                    time.sleep(delay)
+                    body = {
+                        "choices": [{"message": {"role": "assistant", "content": content}}],
+                        "usage": {"prompt_tokens": len(json.dumps(payload)) // 4, "completion_tokens": len(content) // 4},
+                    }
+                    self._send(200, json.dumps(body).encode())
+                    return
+
+                # Like the real API, send each event as its own HTTP chunk
+                chunks = [content[i:i + 16] for i in range(0, len(content), 16)]
+                self.send_response(200)
+                self.send_header('Content-Type', 'text/event-stream')
+                self.send_header('Transfer-Encoding', 'chunked')
+                self.end_headers()
+                try:
+                    for chunk in chunks:
+                        time.sleep(delay / len(chunks))
+                        event = {"choices": [{"delta": {"content": chunk}}]}
+                        self._write_chunk(f"data: {json.dumps(event)}\n\n".encode())
+                    self._write_chunk(b"data: [DONE]\n\n")
+                    self._write_chunk(b"")
+                except (BrokenPipeError, ConnectionResetError):
+                    # The client closed the stream early
+                    self.close_connection = True
+
+            def _write_chunk(self, data: bytes):
+                self.wfile.write(f"{len(data):x}\r\n".encode() + data + b"\r\n")
+                self.wfile.flush()
+
+        return Handler
+
+    def start(self) -> 'StubLLMServer':
+        self._thread = threading.Thread(target=self._server.serve_forever, daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self):
+        self._server.shutdown()
+        self._server.server_close()
+
+    def __enter__(self) -> 'StubLLMServer':
+        return self.start()
+
+    def __exit__(self, *exc_info):
+        self.stop()
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Run a stub OpenRouter server")
+    parser.add_argument('--host', default='127.0.0.1')
+    parser.add_argument('--port', type=int, default=8799)
+    parser.add_argument('--latency', type=float, default=0.5, help="Seconds per response")
+    parser.add_argument('--jitter', type=float, default=0.0, help="Extra random seconds per response")
+    parser.add_argument('--error-rate', type=float, default=0.0, help="Fraction of requests answered with 429")
+    args = parser.parse_args()
+
+    server = StubLLMServer(args.host, args.port, args.latency, args.jitter, args.error_rate)
+    print(f"Stub LLM server listening on {server.url}")
+    try:
+        server._server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+
+
+if __name__ == "__main__":
+    main()
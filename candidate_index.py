@@ -0,0 +1,468 @@
+"""
+Persistent, searchable index of analyzed resumes.
+
+Usage:
+    python candidate_index.py ingest results.jsonl
+    python candidate_index.py search "Kubernetes AND (Go OR Rust)" --min-degree masters --page 2
+    python candidate_index.py search --text "payments platform" --page-size 50
+"""
+import argparse
+import hashlib
+import json
+import os
+import re
+import sqlite3
+import sys
+import threading
+import time
+from contextlib import closing
+from typing import Dict, Iterable, List, Optional, Tuple
+from config import config
+
+# Degree levels, highest first, recognised in the extracted education entries.
+# (?!\w) rather than \b ends each pattern, since abbreviations like 'M.A.' end in a dot;
+# a bare 'MS'/'BS' only counts before 'in'/'of', so 'MS Office' is not a master's
+DEGREE_LEVELS = [
+    (3, re.compile(r'\b(?:ph\.?\s?d|doctor(?:ate)?|d\.phil)(?!\w)', re.IGNORECASE)),
+    (2, re.compile(r"\b(?:masters?|master's|m\.?sc|m\.?tech|m\.?eng|mba|m\.com|m\.a\.|m\.s\.|m\.e\.|ms(?=,?\s+(?:in|of)\b))(?!\w)",
+                   re.IGNORECASE)),
+    (1, re.compile(r"\b(?:bachelors?|bachelor's|b\.?sc|b\.?tech|b\.?eng|bba|b\.com|b\.a\.|b\.s\.|b\.e\.|bs(?=,?\s+(?:in|of)\b))(?!\w)",
+                   re.IGNORECASE)),
+]
+DEGREE_NAMES = {'any': 0, 'bachelors': 1, 'masters': 2, 'phd': 3}
+
+_QUERY_TOKEN = re.compile(r'"([^"]*)"|(\()|(\))|([^\s()"]+)')
+_OPERATORS = ('AND', 'OR', 'NOT')
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS candidates (
+    id INTEGER PRIMARY KEY,
+    source TEXT NOT NULL UNIQUE,
+    target_job TEXT,
+    skills TEXT NOT NULL,
+    education TEXT NOT NULL,
+    work_experience TEXT NOT NULL,
+    analysis TEXT,
+    degree_level INTEGER NOT NULL DEFAULT 0,
+    added_at REAL NOT NULL
+);
+CREATE INDEX IF NOT EXISTS candidates_degree ON candidates (degree_level, id);
+CREATE TABLE IF NOT EXISTS skills (
+    id INTEGER PRIMARY KEY,
+    name TEXT NOT NULL UNIQUE COLLATE NOCASE
+);
+CREATE TABLE IF NOT EXISTS candidate_skills (
+    skill_id INTEGER NOT NULL,
+    candidate_id INTEGER NOT NULL,
+    PRIMARY KEY (skill_id, candidate_id)
+) WITHOUT ROWID;
+CREATE INDEX IF NOT EXISTS candidate_skills_candidate ON candidate_skills (candidate_id);
+CREATE TABLE IF NOT EXISTS meta (
+    key TEXT PRIMARY KEY,
+    value INTEGER NOT NULL
+);
+CREATE VIRTUAL TABLE IF NOT EXISTS candidate_text USING fts5 (
+    skills, education, work_experience, resume_text, tokenize = 'unicode61'
+);
+"""
+
+
+class QuerySyntaxError(ValueError):
+    """
+    Raised when a skill query cannot be parsed
+    """
+
+
+def degree_level(education: Iterable[str]) -> int:
+    """
+    Highest degree level (0 none, 1 bachelor's, 2 master's, 3 doctorate) mentioned in the education entries
+    """
+    best = 0
+    for entry in education:
+        for level, pattern in DEGREE_LEVELS:
+            if level > best and pattern.search(entry):
+                best = level
+                break
+    return best
+
+
+def _tokenize_query(query: str) -> List[Tuple[str, str]]:
+    """
+    Split a query into ('(' | ')' | 'op' | 'term', value) tokens. Runs of bare words
+    form one term, so 'Machine Learning AND Go' has the terms 'Machine Learning' and 'Go'.
+    """
+    tokens: List[Tuple[str, str]] = []
+    extend_term = False
+    for quoted, opening, closing_paren, word in _QUERY_TOKEN.findall(query):
+        if opening or closing_paren:
+            tokens.append((opening or closing_paren, opening or closing_paren))
+            extend_term = False
+        elif word in _OPERATORS:
+            tokens.append(('op', word))
+            extend_term = False
+        elif word and extend_term:
+            tokens[-1] = ('term', tokens[-1][1] + ' ' + word)
+        elif word:
+            tokens.append(('term', word))
+            extend_term = True
+        else:
+            tokens.append(('term', quoted))
+            extend_term = False
+    return tokens
+
+
+class _QueryParser:
+    """
+    Recursive descent parser for boolean skill queries, producing a tree of
+    ('term', skill) / ('not', node) / ('and', [nodes]) / ('or', [nodes]) tuples.
+
+        query := or ; or := and ('OR' and)* ; and := unary (['AND'] unary)*
+        unary := 'NOT' unary | '(' or ')' | term
+    """
+
+    def __init__(self, tokens: List[Tuple[str, str]]):
+        self.tokens = tokens
+        self.position = 0
+
+    def _peek(self) -> Optional[Tuple[str, str]]:
+        return self.tokens[self.position] if self.position < len(self.tokens) else None
+
+    def _take(self) -> Tuple[str, str]:
+        token = self._peek()
+        if token is None:
+            raise QuerySyntaxError("Query ended unexpectedly")
+        self.position += 1
+        return token
+
+    def parse(self) -> Tuple:
+        node = self._or()
+        if self._peek() is not None:
+            raise QuerySyntaxError(f"Unexpected {self._peek()[1]!r} in query")
+        return node
+
+    def _or(self) -> Tuple:
+        parts = [self._and()]
+        while self._peek() == ('op', 'OR'):
+            self._take()
+            parts.append(self._and())
+        return parts[0] if len(parts) == 1 else ('or', parts)
+
+    def _and(self) -> Tuple:
+        parts = [self._unary()]
+        while True:
+            token = self._peek()
+            if token is None or token[0] == ')' or token == ('op', 'OR'):
+                break
+            if token == ('op', 'AND'):
+                self._take()
+            parts.append(self._unary())
+        return parts[0] if len(parts) == 1 else ('and', parts)
+
+    def _unary(self) -> Tuple:
+        kind, value = self._take()
+        if (kind, value) == ('op', 'NOT'):
+            return ('not', self._unary())
+        if kind == '(':
+            node = self._or()
+            if self._take()[0] != ')':
+                raise QuerySyntaxError("Missing closing parenthesis")
+            return node
+        if kind == 'term':
+            return ('term', value)
+        raise QuerySyntaxError(f"Unexpected {value!r} in query")
+
+
+def parse_skill_query(query: str) -> Tuple:
+    """
+    Parse a query like 'Kubernetes AND (Go OR Rust) AND NOT PHP' into a tree.
+    AND/OR/NOT must be upper case; adjacent terms are ANDed.
+    """
+    tokens = _tokenize_query(query)
+    if not tokens:
+        raise QuerySyntaxError("Empty query")
+    return _QueryParser(tokens).parse()
+
+
+def _bitmap(ids: Iterable[int]) -> int:
+    """
+    Pack candidate ids into an int with bit i set for id i
+    """
+    bits = bytearray()
+    for candidate_id in ids:
+        byte = candidate_id >> 3
+        if byte >= len(bits):
+            bits.extend(bytes(byte + 1 - len(bits)))
+        bits[byte] |= 1 << (candidate_id & 7)
+    return int.from_bytes(bits, 'little')
+
+
+def _page_ids(bitmap: int, offset: int, limit: int) -> List[int]:
+    """
+    Ids set in the bitmap, highest first, skipping the first offset of them
+    """
+    data = bitmap.to_bytes((bitmap.bit_length() + 7) // 8, 'little')
+    ids: List[int] = []
+    for byte_index in range(len(data) - 1, -1, -1):
+        byte = data[byte_index]
+        if not byte:
+            continue
+        count = bin(byte).count('1')
+        if offset >= count:
+            offset -= count
+            continue
+        for bit in range(7, -1, -1):
+            if byte >> bit & 1:
+                if offset:
+                    offset -= 1
+                elif len(ids) < limit:
+                    ids.append(byte_index * 8 + bit)
+        if len(ids) >= limit:
+            break
+    return ids
+
+
+class CandidateIndex:
+    """
+    SQLite store of analyzed resumes with an inverted skill index and an FTS5 index
+    over skills, education, experience and (when given) the resume text.
+
+    Skill queries are answered from in-memory bitmaps (one int per skill, bit i set
+    for candidate id i) loaded lazily from the (skill_id, candidate_id) table, so
+    AND/OR/NOT over 100k+ candidates are a few big-int operations. The bitmaps are
+    dropped whenever any process writes to the index.
+    """
+
+    def __init__(self, path: str):
+        from skill_matcher import skill_matcher
+
+        self.path = path
+        self._aliases = {alias.lower(): skill for alias, skill in skill_matcher.aliases.items()}
+        self._lock = threading.Lock()
+        self._generation = None
+        self._bitmaps: Dict[Tuple, int] = {}
+        with closing(self._connect()) as conn:
+            conn.executescript(SCHEMA)
+            conn.commit()
+
+    def _connect(self) -> sqlite3.Connection:
+        directory = os.path.dirname(self.path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        conn = sqlite3.connect(self.path, timeout=30)
+        conn.execute("PRAGMA journal_mode=WAL")
+        conn.execute("PRAGMA synchronous=NORMAL")
+        return conn
+
+    def _canonical(self, skill: str) -> str:
+        return self._aliases.get(skill.lower(), skill)
+
+    @staticmethod
+    def source_for_text(resume_text: str) -> str:
+        """
+        Stable source key for a resume without a file path
+        """
+        return 'text:' + hashlib.sha256(resume_text.encode('utf-8')).hexdigest()
+
+    def add_many(self, records: Iterable[Dict]) -> int:
+        """
+        Insert or replace analyzed resumes in one transaction. Each record has a
+        'source' (or 'path'), 'skills', 'education', 'work_experience' and optionally
+        'target_job', 'analysis' and 'resume_text'. Returns the number stored.
+        """
+        count = 0
+        skill_ids: Dict[str, int] = {}
+        now = time.time()
+        with self._lock, closing(self._connect()) as conn:
+            for record in records:
+                source = record.get('source') or record.get('path')
+                if not source:
+                    continue
+                skills = sorted({self._canonical(skill) for skill in record.get('skills') or []})
+                education = list(record.get('education') or [])
+                experience = list(record.get('work_experience') or [])
+                analysis = record.get('analysis')
+
+                row = conn.execute("SELECT id FROM candidates WHERE source = ?", (source,)).fetchone()
+                if row is not None:
+                    conn.execute("DELETE FROM candidate_skills WHERE candidate_id = ?", (row[0],))
+                    conn.execute("DELETE FROM candidate_text WHERE rowid = ?", (row[0],))
+                    conn.execute("DELETE FROM candidates WHERE id = ?", (row[0],))
+                candidate_id = conn.execute(
+                    "INSERT INTO candidates (id, source, target_job, skills, education, work_experience, analysis, "
+                    "degree_level, added_at) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)",
+                    (row[0] if row is not None else None, source, record.get('target_job'), json.dumps(skills),
+                     json.dumps(education), json.dumps(experience),
+                     json.dumps(analysis) if analysis is not None else None, degree_level(education), now)
+                ).lastrowid
+
+                for skill in skills:
+                    key = skill.lower()
+                    if key not in skill_ids:
+                        conn.execute("INSERT OR IGNORE INTO skills (name) VALUES (?)", (skill,))
+                        skill_ids[key] = conn.execute("SELECT id FROM skills WHERE name = ?", (skill,)).fetchone()[0]
+                conn.executemany("INSERT INTO candidate_skills (skill_id, candidate_id) VALUES (?, ?)",
+                                 [(skill_ids[skill.lower()], candidate_id) for skill in skills])
+                conn.execute(
+                    "INSERT INTO candidate_text (rowid, skills, education, work_experience, resume_text) "
+                    "VALUES (?, ?, ?, ?, ?)",
+                    (candidate_id, ' '.join(skills), '\n'.join(education), '\n'.join(experience),
+                     record.get('resume_text') or '')
+                )
+                count += 1
+            conn.execute("INSERT INTO meta (key, value) VALUES ('generation', 1) "
+                         "ON CONFLICT (key) DO UPDATE SET value = value + 1")
+            conn.commit()
+        return count
+
+    def add(self, record: Dict) -> int:
+        return self.add_many([record])
+
+    def _cached_bitmap(self, conn: sqlite3.Connection, key: Tuple, sql: str, params: Tuple) -> int:
+        bitmap = self._bitmaps.get(key)
+        if bitmap is None:
+            bitmap = self._bitmaps[key] = _bitmap(row[0] for row in conn.execute(sql, params))
+        return bitmap
+
+    def _evaluate(self, conn: sqlite3.Connection, node: Tuple) -> int:
+        kind = node[0]
+        if kind == 'term':
+            skill = self._canonical(node[1])
+            return self._cached_bitmap(
+                conn, ('skill', skill.lower()),
+                "SELECT candidate_id FROM candidate_skills WHERE skill_id = (SELECT id FROM skills WHERE name = ?)",
+                (skill,)
+            )
+        if kind == 'not':
+            everyone = self._cached_bitmap(conn, ('all',), "SELECT id FROM candidates", ())
+            return everyone & ~self._evaluate(conn, node[1])
+        bitmaps = [self._evaluate(conn, child) for child in node[1]]
+        result = bitmaps[0]
+        for bitmap in bitmaps[1:]:
+            result = result & bitmap if kind == 'and' else result | bitmap
+        return result
+
+    def search(self, query: Optional[str] = None, min_degree: str = 'any', text: Optional[str] = None,
+               page: int = 1, page_size: int = 20) -> Dict:
+        """
+        Find candidates matching a boolean skill query, a minimum degree and/or an FTS5
+        full text query, most recently indexed first. Returns the total match count and
+        one page of results.
+        """
+        if min_degree not in DEGREE_NAMES:
+            raise ValueError(f"Unknown degree {min_degree!r}, expected one of {', '.join(DEGREE_NAMES)}")
+        tree = parse_skill_query(query) if query and query.strip() else None
+        page = max(1, page)
+        page_size = max(1, min(page_size, 500))
+
+        with self._lock, closing(self._connect()) as conn:
+            row = conn.execute("SELECT value FROM meta WHERE key = 'generation'").fetchone()
+            generation = row[0] if row else 0
+            if generation != self._generation:
+                self._bitmaps.clear()
+                self._generation = generation
+
+            matches = self._cached_bitmap(conn, ('all',), "SELECT id FROM candidates", ())
+            if tree is not None:
+                matches &= self._evaluate(conn, tree)
+            if DEGREE_NAMES[min_degree]:
+                matches &= self._cached_bitmap(conn, ('degree', DEGREE_NAMES[min_degree]),
+                                               "SELECT id FROM candidates WHERE degree_level >= ?",
+                                               (DEGREE_NAMES[min_degree],))
+            if text and text.strip():
+                try:
+                    matches &= _bitmap(row[0] for row in conn.execute(
+                        "SELECT rowid FROM candidate_text WHERE candidate_text MATCH ?", (text,)))
+                except sqlite3.OperationalError as e:
+                    raise QuerySyntaxError(f"Invalid full text query: {str(e)}") from e
+
+            total = bin(matches).count('1')
+            ids = _page_ids(matches, (page - 1) * page_size, page_size)
+            rows = conn.execute(
+                "SELECT id, source, target_job, skills, education, work_experience, analysis, degree_level, added_at "
+                f"FROM candidates WHERE id IN ({', '.join('?' * len(ids))}) ORDER BY id DESC", ids
+            ).fetchall() if ids else []
+
+        results = [{
+            'id': row[0],
+            'source': row[1],
+            'target_job': row[2],
+            'skills': json.loads(row[3]),
+            'education': json.loads(row[4]),
+            'work_experience': json.loads(row[5]),
+            'analysis': json.loads(row[6]) if row[6] else None,
+            'degree_level': row[7],
+            'added_at': row[8],
+        } for row in rows]
+        return {
+            'total': total,
+            'page': page,
+            'page_size': page_size,
+            'pages': -(-total // page_size),
+            'results': results,
+        }
+
+    def count(self) -> int:
+        with self._lock, closing(self._connect()) as conn:
+            return conn.execute("SELECT COUNT(*) FROM candidates").fetchone()[0]
+
+
+def iter_jsonl(path: str) -> Iterable[Dict]:
+    with open(path, encoding='utf-8') as f:
+        for line in f:
+            line = line.strip()
+            if not line:
+                continue
+            try:
+                record = json.loads(line)
+            except json.JSONDecodeError:
+                continue
+            if not record.get('error'):
+                yield record
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description="Ingest analyzed resumes and search them by skills, degree and text")
+    parser.add_argument('--index', default=config.CANDIDATE_INDEX_PATH, help="Index database path")
+    commands = parser.add_subparsers(dest='command', required=True)
+
+    ingest = commands.add_parser('ingest', help="Add batch_analyzer JSONL results to the index")
+    ingest.add_argument('results', nargs='+', help="JSONL files written by batch_analyzer.py")
+    ingest.add_argument('--batch-size', type=int, default=1000, help="Records per transaction")
+
+    search = commands.add_parser('search', help="Search the index")
+    search.add_argument('query', nargs='?', help="Boolean skill query, e.g. 'Kubernetes AND (Go OR Rust)'")
+    search.add_argument('--min-degree', choices=list(DEGREE_NAMES), default='any')
+    search.add_argument('--text', help="FTS5 full text query over skills, education, experience and resume text")
+    search.add_argument('--page', type=int, default=1)
+    search.add_argument('--page-size', type=int, default=20)
+    args = parser.parse_args(argv)
+
+    index = CandidateIndex(args.index)
+    if args.command == 'ingest':
+        stored = 0
+        batch: List[Dict] = []
+        for path in args.results:
+            for record in iter_jsonl(path):
+                batch.append(record)
+                if len(batch) >= args.batch_size:
+                    stored += index.add_many(batch)
+                    batch = []
+        stored += index.add_many(batch)
+        print(f"Indexed {stored} resumes ({index.count()} in {args.index})", file=sys.stderr)
+        return 0
+
+    started = time.perf_counter()
+    try:
+        page = index.search(args.query, args.min_degree, args.text, args.page, args.page_size)
+    except QuerySyntaxError as e:
+        print(f"Invalid query: {str(e)}", file=sys.stderr)
+        return 2
+    elapsed = (time.perf_counter() - started) * 1000
+    for result in page['results']:
+        print(json.dumps(result))
+    print(f"{page['total']} matches, page {page['page']}/{max(page['pages'], 1)} ({elapsed:.1f} ms)", file=sys.stderr)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -8,12 +8,63 @@ class Config:
     
     # OpenRouter API Configuration
     OPENROUTER_API_KEY: Optional[str] = os.getenv('OPENROUTER_API_KEY', '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')
+    OPENROUTER_BASE_URL: str = os.getenv('OPENROUTER_BASE_URL', 'https://openrouter.ai/api/v1')
     
     # Model Configuration
     LLM_MODEL: str = os.getenv('LLM_MODEL', 'openai/gpt-oss-120b:free')
     TEMPERATURE: float = float(os.getenv('TEMPERATURE', '0.3'))
     MAX_TOKENS: int = int(os.getenv('MAX_TOKENS', '1000'))
     REASONING_ENABLED: bool = os.getenv('REASONING_ENABLED', 'false').lower() == 'true'
+    # Approximate token budget for the resume part of the prompt (0 sends the raw text)
+    PROMPT_TOKEN_BUDGET: int = int(os.getenv('PROMPT_TOKEN_BUDGET', '1500'))
+    # Roles sent together in one multi-role analysis request
+    MAX_ROLES_PER_CALL: int = int(os.getenv('MAX_ROLES_PER_CALL', '5'))
+    # Re-analyze an edited resume from its changed sections and the previous analysis,
+    # unless more than this fraction of the text changed
+    INCREMENTAL_ANALYSIS: bool = os.getenv('INCREMENTAL_ANALYSIS', 'true').lower() == 'true'
+    INCREMENTAL_MAX_CHANGED_RATIO: float = float(os.getenv('INCREMENTAL_MAX_CHANGED_RATIO', '0.5'))
+    
+    # Skill Extraction Configuration
+    SKILL_TAXONOMY_PATH: str = os.getenv(
+        'SKILL_TAXONOMY_PATH',
+        os.path.join(os.path.dirname(os.path.abspath(__file__)), 'skills_taxonomy.json')
+    )
+    
+    # PDF Extraction Configuration
+    PDF_WORKERS: int = int(os.getenv('PDF_WORKERS', str(min(4, os.cpu_count() or 1))))
+    PDF_PARALLEL_MIN_PAGES: int = int(os.getenv('PDF_PARALLEL_MIN_PAGES', '8'))
+    PDF_CACHE_MAX_ENTRIES: int = int(os.getenv('PDF_CACHE_MAX_ENTRIES', '64'))
+    
+    # LLM Client Configuration
+    LLM_TIMEOUT: float = float(os.getenv('LLM_TIMEOUT', '60'))
+    LLM_MAX_RETRIES: int = int(os.getenv('LLM_MAX_RETRIES', '3'))
+    LLM_BACKOFF_BASE: float = float(os.getenv('LLM_BACKOFF_BASE', '1.0'))
+    LLM_BACKOFF_MAX: float = float(os.getenv('LLM_BACKOFF_MAX', '30'))
+    LLM_MAX_CONCURRENCY: int = int(os.getenv('LLM_MAX_CONCURRENCY', '8'))
+    LLM_STREAMING: bool = os.getenv('LLM_STREAMING', 'true').lower() == 'true'
+    
+    # Background Job Configuration
+    # Analyses running at once across all sessions, and how many more may wait for a worker
+    ANALYSIS_WORKERS: int = int(os.getenv('ANALYSIS_WORKERS', str(LLM_MAX_CONCURRENCY)))
+    ANALYSIS_MAX_QUEUED: int = int(os.getenv('ANALYSIS_MAX_QUEUED', '32'))
+    ANALYSIS_POLL_INTERVAL: float = float(os.getenv('ANALYSIS_POLL_INTERVAL', '1.0'))
+    
+    # LLM Cache Configuration
+    LLM_CACHE_ENABLED: bool = os.getenv('LLM_CACHE_ENABLED', 'true').lower() == 'true'
+    LLM_CACHE_PATH: str = os.getenv('LLM_CACHE_PATH', os.path.join('.cache', 'llm_cache.sqlite3'))
+    LLM_CACHE_TTL: float = float(os.getenv('LLM_CACHE_TTL', str(7 * 24 * 3600)))
+    LLM_CACHE_MAX_ENTRIES: int = int(os.getenv('LLM_CACHE_MAX_ENTRIES', '5000'))
+    
+    # Candidate Index Configuration (opt-in: the index keeps every analyzed resume's full text)
+    CANDIDATE_INDEX_ENABLED: bool = os.getenv('CANDIDATE_INDEX_ENABLED', 'false').lower() == 'true'
+    CANDIDATE_INDEX_PATH: str = os.getenv('CANDIDATE_INDEX_PATH', os.path.join('.cache', 'candidates.sqlite3'))
+    
+    # Metrics Configuration
+    METRICS_ENABLED: bool = os.getenv('METRICS_ENABLED', 'false').lower() == 'true'
+    # Serve Prometheus metrics on this port from the Streamlit process (0 disables)
+    METRICS_PORT: int = int(os.getenv('METRICS_PORT', '0'))
+    # Log each request's stage timings and counters as a JSON line
+    METRICS_JSON_LOG: bool = os.getenv('METRICS_JSON_LOG', 'false').lower() == 'true'
     
     # Application Configuration
     APP_TITLE: str = "Resume Analyzer AI Agent"
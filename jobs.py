@@ -0,0 +1,168 @@
+import itertools
+import threading
+import time
+from concurrent.futures import Future, ThreadPoolExecutor
+from typing import Any, Callable, Dict, List, Optional
+
+QUEUED = 'queued'
+RUNNING = 'running'
+DONE = 'done'
+FAILED = 'failed'
+CANCELLED = 'cancelled'
+FINISHED_STATES = (DONE, FAILED, CANCELLED)
+
+
+class QueueFullError(Exception):
+    """
+    Raised when a job is submitted while the queue is at capacity
+    """
+
+    def __init__(self, depth: int, capacity: int):
+        super().__init__(f"Job queue is full ({depth}/{capacity} jobs waiting or running)")
+        self.depth = depth
+        self.capacity = capacity
+
+
+class Job:
+    """
+    A unit of work running on the shared pool.
+
+    The work function receives the job as its first argument, so it can publish
+    partial results through job.partial and stop early once job.cancel_requested.
+    """
+
+    def __init__(self, job_id: str, fn: Callable, args: tuple, kwargs: Dict):
+        self.id = job_id
+        self.fn = fn
+        self.args = args
+        self.kwargs = kwargs
+        self.status = QUEUED
+        self.result: Any = None
+        self.error: Optional[str] = None
+        self.partial: Dict[str, List[str]] = {}
+        self.submitted_at = time.time()
+        self.started_at: Optional[float] = None
+        self.finished_at: Optional[float] = None
+        self.future: Optional[Future] = None
+        self._cancel = threading.Event()
+
+    @property
+    def cancel_requested(self) -> bool:
+        return self._cancel.is_set()
+
+    @property
+    def finished(self) -> bool:
+        return self.status in FINISHED_STATES
+
+    def elapsed(self) -> float:
+        end = self.finished_at or time.time()
+        return end - (self.started_at or self.submitted_at)
+
+
+class JobManager:
+    """
+    Runs jobs on a bounded, process-wide thread pool.
+
+    At most max_workers jobs run at once and at most max_queued more wait for a
+    worker; submitting beyond that raises QueueFullError instead of growing the
+    backlog. Finished jobs are kept for retention seconds so their owners can
+    collect the results.
+    """
+
+    def __init__(self, max_workers: int = 8, max_queued: int = 32, retention: float = 600.0):
+        self.max_workers = max_workers
+        self.max_queued = max_queued
+        self.retention = retention
+        self._executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix='analysis-job')
+        self._jobs: Dict[str, Job] = {}
+        self._lock = threading.Lock()
+        self._ids = itertools.count(1)
+
+    @property
+    def capacity(self) -> int:
+        return self.max_workers + self.max_queued
+
+    def _active(self) -> List[Job]:
+        return [job for job in self._jobs.values() if not job.finished]
+
+    def _prune(self):
+        cutoff = time.time() - self.retention
+        for job_id in [job_id for job_id, job in self._jobs.items()
+                       if job.finished and job.finished_at < cutoff]:
+            del self._jobs[job_id]
+
+    def submit(self, fn: Callable, *args, **kwargs) -> Job:
+        """
+        Queue fn(job, *args, **kwargs) and return its Job without waiting for it
+        """
+        with self._lock:
+            self._prune()
+            depth = len(self._active())
+            if depth >= self.capacity:
+                raise QueueFullError(depth, self.capacity)
+            job = Job(str(next(self._ids)), fn, args, kwargs)
+            self._jobs[job.id] = job
+            job.future = self._executor.submit(self._run, job)
+        return job
+
+    def _run(self, job: Job):
+        if job.cancel_requested:
+            self._finish(job, CANCELLED)
+            return
+        job.started_at = time.time()
+        job.status = RUNNING
+        try:
+            result = job.fn(job, *job.args, **job.kwargs)
+        except Exception as e:
+            job.error = f"{type(e).__name__}: {str(e)}"
+            self._finish(job, FAILED)
+            return
+        if job.cancel_requested:
+            self._finish(job, CANCELLED)
+        else:
+            job.result = result
+            self._finish(job, DONE)
+
+    def _finish(self, job: Job, status: str):
+        job.finished_at = time.time()
+        job.status = status
+
+    def get(self, job_id: str) -> Optional[Job]:
+        with self._lock:
+            return self._jobs.get(job_id)
+
+    def cancel(self, job_id: str) -> bool:
+        """
+        Cancel a job. Queued jobs never start; running jobs are asked to stop and
+        their result is discarded. Returns False if the job had already finished.
+        """
+        job = self.get(job_id)
+        if job is None or job.finished:
+            return False
+        job._cancel.set()
+        if job.future is not None and job.future.cancel():
+            self._finish(job, CANCELLED)
+        return True
+
+    def queue_position(self, job_id: str) -> int:
+        """
+        Number of queued jobs ahead of this one (0 once it is running)
+        """
+        with self._lock:
+            job = self._jobs.get(job_id)
+            if job is None or job.status != QUEUED:
+                return 0
+            return sum(1 for other in self._jobs.values()
+                       if other.status == QUEUED and int(other.id) < int(job.id))
+
+    def stats(self) -> Dict[str, int]:
+        with self._lock:
+            active = self._active()
+            running = sum(1 for job in active if job.status == RUNNING)
+        return {'running': running, 'queued': len(active) - running, 'capacity': self.capacity}
+
+    def shutdown(self, wait: bool = True):
+        with self._lock:
+            for job in self._active():
+                job._cancel.set()
+        self._executor.shutdown(wait=wait, cancel_futures=True)
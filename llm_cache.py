@@ -0,0 +1,160 @@
+import hashlib
+import json
+import logging
+import os
+import re
+import sqlite3
+import threading
+import time
+from contextlib import closing
+from typing import Dict, Optional
+from config import config
+from metrics import metrics
+
+logger = logging.getLogger(__name__)
+
+
+def normalize_text(text: str) -> str:
+    """
+    Collapse whitespace so formatting-only differences share a cache entry
+    """
+    return re.sub(r'\s+', ' ', text).strip()
+
+
+class LLMCache:
+    """
+    Persistent SQLite cache for LLM analyses.
+
+    Entries are keyed on a hash of everything that affects the completion: the
+    normalized resume text, the target job, the model settings and the prompt
+    version. Entries expire after ttl seconds, and once max_entries is exceeded the
+    least recently used ones are evicted.
+    """
+
+    def __init__(self, path: str, ttl: float, max_entries: int, enabled: bool = True):
+        self.path = path
+        self.ttl = ttl
+        self.max_entries = max_entries
+        self.enabled = enabled
+        self.hits = 0
+        self.misses = 0
+        self._lock = threading.Lock()
+        self._initialized = False
+
+    def _connect(self) -> sqlite3.Connection:
+        directory = os.path.dirname(self.path)
+        if not self._initialized and directory:
+            os.makedirs(directory, exist_ok=True)
+        conn = sqlite3.connect(self.path, timeout=10)
+        if not self._initialized:
+            conn.execute(
+                "CREATE TABLE IF NOT EXISTS llm_cache ("
+                "key TEXT PRIMARY KEY, value TEXT NOT NULL, created_at REAL NOT NULL, last_access REAL NOT NULL)"
+            )
+            conn.execute("CREATE INDEX IF NOT EXISTS llm_cache_last_access ON llm_cache (last_access)")
+            conn.commit()
+            self._initialized = True
+        return conn
+
+    @staticmethod
+    def make_key(resume_text: str, target_job: str, prompt_version: str) -> str:
+        """
+        Build the cache key for a resume/job pair under the current model settings
+        """
+        payload = json.dumps({
+            'resume_text': normalize_text(resume_text),
+            'target_job': normalize_text(target_job).lower(),
+            'model': config.LLM_MODEL,
+            'temperature': config.TEMPERATURE,
+            'max_tokens': config.MAX_TOKENS,
+            'reasoning': config.REASONING_ENABLED,
+            'prompt_token_budget': config.PROMPT_TOKEN_BUDGET,
+            'prompt_version': prompt_version,
+        }, sort_keys=True)
+        return hashlib.sha256(payload.encode('utf-8')).hexdigest()
+
+    def get(self, key: str) -> Optional[Dict]:
+        """
+        Return the cached analysis for a key, or None on a miss or expired entry
+        """
+        if not self.enabled:
+            return None
+        now = time.time()
+        try:
+            with self._lock, closing(self._connect()) as conn:
+                row = conn.execute("SELECT value, created_at FROM llm_cache WHERE key = ?", (key,)).fetchone()
+                if row is not None and now - row[1] > self.ttl:
+                    conn.execute("DELETE FROM llm_cache WHERE key = ?", (key,))
+                    conn.commit()
+                    row = None
+                if row is not None:
+                    conn.execute("UPDATE llm_cache SET last_access = ? WHERE key = ?", (now, key))
+                    conn.commit()
+        except sqlite3.Error as e:
+            # A broken cache must never block an analysis
+            logger.warning("LLM cache lookup failed: %s", e)
+            metrics.increment('llm_cache_errors_total', operation='get')
+            row = None
+        if row is None:
+            self.misses += 1
+            metrics.increment('llm_cache_requests_total', result='miss')
+            return None
+        self.hits += 1
+        metrics.increment('llm_cache_requests_total', result='hit')
+        return json.loads(row[0])
+
+    def set(self, key: str, analysis: Dict):
+        """
+        Store an analysis and evict the least recently used entries over the size limit
+        """
+        if not self.enabled:
+            return
+        now = time.time()
+        try:
+            with self._lock, closing(self._connect()) as conn:
+                conn.execute(
+                    "INSERT OR REPLACE INTO llm_cache (key, value, created_at, last_access) VALUES (?, ?, ?, ?)",
+                    (key, json.dumps(analysis), now, now)
+                )
+                conn.execute("DELETE FROM llm_cache WHERE created_at < ?", (now - self.ttl,))
+                conn.execute(
+                    "DELETE FROM llm_cache WHERE key IN ("
+                    "SELECT key FROM llm_cache ORDER BY last_access DESC LIMIT -1 OFFSET ?)",
+                    (self.max_entries,)
+                )
+                conn.commit()
+        except sqlite3.Error as e:
+            logger.warning("LLM cache write failed: %s", e)
+            metrics.increment('llm_cache_errors_total', operation='set')
+
+    def clear(self):
+        """
+        Remove every cached entry
+        """
+        with self._lock, closing(self._connect()) as conn:
+            conn.execute("DELETE FROM llm_cache")
+            conn.commit()
+
+    def stats(self) -> Dict[str, int]:
+        """
+        Return hit/miss counters for this process and the number of stored entries
+        """
+        entries = 0
+        if self.enabled:
+            try:
+                with self._lock, closing(self._connect()) as conn:
+                    entries = conn.execute("SELECT COUNT(*) FROM llm_cache").fetchone()[0]
+            except (sqlite3.Error, OSError) as e:
+                # Only shown in the sidebar; an unreadable cache must not break the page
+                logger.warning("LLM cache stats failed: %s", e)
+                metrics.increment('llm_cache_errors_total', operation='stats')
+        return {'hits': self.hits, 'misses': self.misses, 'entries': entries}
+
+
+# Create a global cache instance
+llm_cache = LLMCache(
+    config.LLM_CACHE_PATH,
+    ttl=config.LLM_CACHE_TTL,
+    max_entries=config.LLM_CACHE_MAX_ENTRIES,
+    enabled=config.LLM_CACHE_ENABLED
+)
@@ -0,0 +1,212 @@
+import json
+import random
+import threading
+import time
+from contextlib import closing
+from typing import TYPE_CHECKING, Dict, Iterator, Optional
+from config import config
+from metrics import metrics
+
+if TYPE_CHECKING:
+    import requests
+
+# Status codes worth retrying: rate limiting and transient server errors
+RETRY_STATUSES = {429, 500, 502, 503, 504}
+
+
+class LLMError(Exception):
+    """
+    Raised when the LLM API cannot return a usable response
+    """
+
+    def __init__(self, message: str, status_code: Optional[int] = None, body: str = ""):
+        super().__init__(message)
+        self.status_code = status_code
+        self.body = body
+
+
+def parse_retry_after(value: Optional[str]) -> Optional[float]:
+    """
+    Parse a Retry-After header given either in seconds or as an HTTP date
+    """
+    if not value:
+        return None
+    try:
+        return max(0.0, float(value))
+    except ValueError:
+        pass
+    import email.utils
+    try:
+        retry_at = email.utils.parsedate_to_datetime(value)
+    except (TypeError, ValueError):
+        return None
+    return max(0.0, retry_at.timestamp() - time.time())
+
+
+def _record_usage(usage: Optional[Dict]):
+    """
+    Count the prompt and completion tokens reported in a response's usage block
+    """
+    if not isinstance(usage, dict):
+        return
+    for field in ('prompt_tokens', 'completion_tokens'):
+        if isinstance(usage.get(field), (int, float)):
+            metrics.increment(f'llm_{field}_total', usage[field])
+
+
+class LLMClient:
+    """
+    OpenRouter chat completions client built on a shared, pooled HTTP session.
+
+    Every call reuses connections from the pool, has a timeout, and retries
+    429/5xx responses and connection errors with exponential backoff and full
+    jitter, honouring Retry-After when the server sends one.
+    """
+
+    def __init__(self, base_url: str, api_key: Optional[str], timeout: float = 60.0, max_retries: int = 3,
+                 backoff_base: float = 1.0, backoff_max: float = 30.0, pool_size: int = 10):
+        self.base_url = base_url.rstrip('/')
+        self.api_key = api_key
+        self.timeout = timeout
+        self.max_retries = max_retries
+        self.backoff_base = backoff_base
+        self.backoff_max = backoff_max
+        self.pool_size = pool_size
+        self._session: Optional['requests.Session'] = None
+        self._session_lock = threading.Lock()
+
+    @property
+    def session(self) -> 'requests.Session':
+        if self._session is None:
+            with self._session_lock:
+                if self._session is None:
+                    # requests is imported on first use so importing the client stays cheap
+                    import requests
+                    from requests.adapters import HTTPAdapter
+                    session = requests.Session()
+                    adapter = HTTPAdapter(pool_connections=self.pool_size, pool_maxsize=self.pool_size)
+                    session.mount('http://', adapter)
+                    session.mount('https://', adapter)
+                    self._session = session
+        return self._session
+
+    def _backoff_delay(self, attempt: int, retry_after: Optional[float] = None) -> float:
+        if retry_after is not None:
+            return retry_after
+        return random.uniform(0, min(self.backoff_max, self.backoff_base * (2 ** attempt)))
+
+    def _post(self, payload: Dict, stream: bool = False) -> 'requests.Response':
+        """
+        POST to the chat completions endpoint, retrying until a 200 response arrives
+        """
+        import requests
+        url = f"{self.base_url}/chat/completions"
+        headers = {
+            "Authorization": f"Bearer {self.api_key}",
+            "Content-Type": "application/json",
+        }
+        body = json.dumps(payload)
+
+        attempt = 0
+        while True:
+            retry_after = None
+            try:
+                response = self.session.post(url, headers=headers, data=body, timeout=self.timeout, stream=stream)
+            except (requests.ConnectionError, requests.Timeout) as e:
+                metrics.increment('llm_connection_errors_total', kind=type(e).__name__)
+                if attempt >= self.max_retries:
+                    raise LLMError(f"Request failed after {attempt + 1} attempts: {str(e)}") from e
+            else:
+                metrics.increment('llm_responses_total', status=str(response.status_code))
+                if response.status_code == 200:
+                    return response
+                if response.status_code not in RETRY_STATUSES or attempt >= self.max_retries:
+                    raise LLMError(f"API request failed with status {response.status_code}",
+                                   response.status_code, response.text)
+                retry_after = parse_retry_after(response.headers.get('Retry-After'))
+                if retry_after is not None and retry_after > self.backoff_max:
+                    # The server wants us to back off longer than we are willing to wait
+                    raise LLMError(f"API request failed with status {response.status_code} "
+                                   f"(Retry-After {retry_after:.0f}s)", response.status_code, response.text)
+                response.close()
+
+            metrics.increment('llm_retries_total')
+            time.sleep(self._backoff_delay(attempt, retry_after))
+            attempt += 1
+
+    def chat_completion(self, payload: Dict) -> Dict:
+        """
+        POST a chat completion request and return the decoded JSON response
+        """
+        with metrics.timer('llm_request'):
+            response = self._post(payload)
+            try:
+                response_json = response.json()
+            except ValueError as e:
+                raise LLMError("API response is not valid JSON", response.status_code, response.text) from e
+        if isinstance(response_json, dict):
+            _record_usage(response_json.get('usage'))
+        return response_json
+
+    def stream_chat_completion(self, payload: Dict) -> Iterator[str]:
+        """
+        Request a streamed (SSE) chat completion and yield content deltas as they arrive.
+        Only opening the stream is retried; a stream that breaks part way raises LLMError.
+        """
+        import requests
+        started = time.perf_counter()
+        first_content = True
+        response = self._post(dict(payload, stream=True), stream=True)
+        response.encoding = 'utf-8'
+        with closing(response):
+            try:
+                for line in response.iter_lines(decode_unicode=True):
+                    # Blank lines separate events and ':' lines are keep-alive comments
+                    if not line or line.startswith(':') or not line.startswith('data:'):
+                        continue
+                    data = line[len('data:'):].strip()
+                    if data == '[DONE]':
+                        return
+                    try:
+                        chunk = json.loads(data)
+                    except ValueError:
+                        continue
+                    if 'error' in chunk:
+                        error = chunk['error']
+                        message = error.get('message', str(error)) if isinstance(error, dict) else str(error)
+                        raise LLMError(f"Stream failed: {message}", body=data)
+                    _record_usage(chunk.get('usage'))
+                    choices = chunk.get('choices') or []
+                    if choices:
+                        content = (choices[0].get('delta') or {}).get('content')
+                        if content:
+                            if first_content:
+                                metrics.observe('llm_time_to_first_token', time.perf_counter() - started)
+                                first_content = False
+                            yield content
+            except requests.RequestException as e:
+                raise LLMError(f"Stream interrupted: {str(e)}") from e
+
+    async def achat_completion(self, payload: Dict) -> Dict:
+        """
+        Async wrapper around chat_completion that runs the call in a worker thread
+        """
+        import asyncio
+        return await asyncio.to_thread(self.chat_completion, payload)
+
+    def close(self):
+        if self._session is not None:
+            self._session.close()
+            self._session = None
+
+
+# Create a global client instance
+llm_client = LLMClient(
+    config.OPENROUTER_BASE_URL,
+    config.OPENROUTER_API_KEY,
+    timeout=config.LLM_TIMEOUT,
+    max_retries=config.LLM_MAX_RETRIES,
+    backoff_base=config.LLM_BACKOFF_BASE,
+    backoff_max=config.LLM_BACKOFF_MAX,
+    pool_size=config.LLM_MAX_CONCURRENCY
+)
@@ -0,0 +1,266 @@
+"""
+Lightweight timing and counter instrumentation for the analysis pipeline.
+
+Usage:
+    with metrics.timer('extract_skills'):
+        ...
+
+    @timed('pdf_extraction')
+    def extract(data): ...
+
+    metrics.increment('llm_fallbacks_total', reason='invalid_json')
+
+Recording is a no-op unless METRICS_ENABLED is set or a request trace is active
+(see Metrics.trace_request), so the instrumentation can stay in the hot paths.
+"""
+import bisect
+import contextvars
+import json
+import logging
+import threading
+import time
+from contextlib import contextmanager
+from functools import wraps
+from typing import TYPE_CHECKING, Dict, Iterator, List, Optional, Tuple
+from config import config
+
+if TYPE_CHECKING:
+    from http.server import ThreadingHTTPServer
+
+logger = logging.getLogger(__name__)
+
+# Upper bounds (seconds) of the stage duration histogram buckets
+DURATION_BUCKETS = (0.001, 0.005, 0.01, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0, 60.0)
+
+_current_trace: 'contextvars.ContextVar[Optional[RequestTrace]]' = contextvars.ContextVar('metrics_trace', default=None)
+
+
+def _series_name(name: str, labels: Tuple[Tuple[str, str], ...]) -> str:
+    if not labels:
+        return name
+    return name + '{' + ','.join(f'{key}="{value}"' for key, value in labels) + '}'
+
+
+class RequestTrace:
+    """
+    Stage timings and counters recorded while handling a single request
+    """
+
+    def __init__(self):
+        self.stages: List[Tuple[str, float]] = []
+        self.counters: Dict[str, float] = {}
+
+    def as_dict(self) -> Dict:
+        return {
+            'stages': [{'stage': stage, 'ms': round(seconds * 1000, 3)} for stage, seconds in self.stages],
+            'total_ms': round(sum(seconds for _, seconds in self.stages) * 1000, 3),
+            'counters': dict(self.counters),
+        }
+
+
+class _NullTimer:
+    __slots__ = ()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        return False
+
+
+_NULL_TIMER = _NullTimer()
+
+
+class _Timer:
+    __slots__ = ('metrics', 'stage', 'started')
+
+    def __init__(self, metrics: 'Metrics', stage: str):
+        self.metrics = metrics
+        self.stage = stage
+
+    def __enter__(self):
+        self.started = time.perf_counter()
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.metrics.observe(self.stage, time.perf_counter() - self.started)
+        if exc_type is not None:
+            self.metrics.increment('stage_errors_total', stage=self.stage)
+        return False
+
+
+class Metrics:
+    """
+    Process-wide registry of counters and stage duration histograms.
+
+    Counters are keyed by name and labels. Stage timings feed a histogram per stage
+    (exported as stage_duration_seconds) and the active request trace, if any.
+    """
+
+    def __init__(self, enabled: bool = False):
+        self.enabled = enabled
+        self._lock = threading.Lock()
+        self._counters: Dict[Tuple[str, Tuple[Tuple[str, str], ...]], float] = {}
+        # stage -> [bucket counts..., +Inf count, sum]
+        self._histograms: Dict[str, List[float]] = {}
+        self._server: Optional['ThreadingHTTPServer'] = None
+
+    def timer(self, stage: str):
+        """
+        Context manager timing a pipeline stage
+        """
+        if not self.enabled and _current_trace.get() is None:
+            return _NULL_TIMER
+        return _Timer(self, stage)
+
+    def observe(self, stage: str, seconds: float):
+        """
+        Record a stage duration measured elsewhere
+        """
+        trace = _current_trace.get()
+        if trace is not None:
+            trace.stages.append((stage, seconds))
+        if not self.enabled:
+            return
+        with self._lock:
+            histogram = self._histograms.get(stage)
+            if histogram is None:
+                histogram = self._histograms[stage] = [0.0] * (len(DURATION_BUCKETS) + 2)
+            histogram[bisect.bisect_left(DURATION_BUCKETS, seconds)] += 1
+            histogram[-1] += seconds
+
+    def increment(self, name: str, value: float = 1.0, **labels: str):
+        """
+        Add value to a counter, e.g. increment('llm_responses_total', status='429')
+        """
+        trace = _current_trace.get()
+        if not self.enabled and trace is None:
+            return
+        key = (name, tuple(sorted((label, str(label_value)) for label, label_value in labels.items())))
+        if trace is not None:
+            series = _series_name(*key)
+            trace.counters[series] = trace.counters.get(series, 0) + value
+        if self.enabled:
+            with self._lock:
+                self._counters[key] = self._counters.get(key, 0) + value
+
+    @contextmanager
+    def trace_request(self, trace: Optional[RequestTrace] = None) -> Iterator[RequestTrace]:
+        """
+        Record every stage and counter inside the block (including worker threads
+        started with asyncio.to_thread) into a RequestTrace, even when metrics are
+        disabled. Pass an existing trace to keep adding to it.
+        """
+        trace = trace if trace is not None else RequestTrace()
+        token = _current_trace.set(trace)
+        try:
+            yield trace
+        finally:
+            _current_trace.reset(token)
+
+    def log_trace(self, trace: RequestTrace):
+        """
+        Emit a finished request trace as one JSON log line
+        """
+        logger.info(json.dumps(dict(trace.as_dict(), event='request_trace')))
+
+    def snapshot(self) -> Dict:
+        """
+        Structured copy of every counter and stage histogram
+        """
+        with self._lock:
+            counters = {_series_name(name, labels): value for (name, labels), value in sorted(self._counters.items())}
+            stages = {}
+            for stage, histogram in sorted(self._histograms.items()):
+                count = sum(histogram[:-1])
+                stages[stage] = {'count': int(count), 'sum_s': round(histogram[-1], 6),
+                                 'mean_ms': round(histogram[-1] / count * 1000, 3) if count else 0.0}
+        return {'counters': counters, 'stages': stages}
+
+    def log_snapshot(self):
+        """
+        Emit the current snapshot as one JSON log line
+        """
+        logger.info(json.dumps(dict(self.snapshot(), event='metrics_snapshot')))
+
+    def to_prometheus(self) -> str:
+        """
+        Render every metric in the Prometheus text exposition format
+        """
+        lines = []
+        with self._lock:
+            counters = sorted(self._counters.items())
+            histograms = sorted((stage, list(histogram)) for stage, histogram in self._histograms.items())
+
+        typed = set()
+        for (name, labels), value in counters:
+            if name not in typed:
+                lines.append(f"# TYPE {name} counter")
+                typed.add(name)
+            lines.append(f"{_series_name(name, labels)} {value:g}")
+
+        if histograms:
+            lines.append("# TYPE stage_duration_seconds histogram")
+        for stage, histogram in histograms:
+            cumulative = 0.0
+            for bound, count in zip(DURATION_BUCKETS + ('+Inf',), histogram[:-1]):
+                cumulative += count
+                lines.append(f'stage_duration_seconds_bucket{{stage="{stage}",le="{bound}"}} {cumulative:g}')
+            lines.append(f'stage_duration_seconds_sum{{stage="{stage}"}} {histogram[-1]:.6f}')
+            lines.append(f'stage_duration_seconds_count{{stage="{stage}"}} {cumulative:g}')
+        return '\n'.join(lines) + '\n'
+
+    def reset(self):
+        with self._lock:
+            self._counters.clear()
+            self._histograms.clear()
+
+    def serve(self, port: int, host: str = '0.0.0.0'):
+        """
+        Serve /metrics in the Prometheus format from a daemon thread (once per process)
+        """
+        # http.server pulls in half the email package, so only load it when serving
+        from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+        with self._lock:
+            if self._server is not None:
+                return
+            registry = self
+
+            class Handler(BaseHTTPRequestHandler):
+                def log_message(self, *args):
+                    pass
+
+                def do_GET(self):
+                    if self.path.split('?')[0] != '/metrics':
+                        self.send_error(404)
+                        return
+                    body = registry.to_prometheus().encode()
+                    self.send_response(200)
+                    self.send_header('Content-Type', 'text/plain; version=0.0.4')
+                    self.send_header('Content-Length', str(len(body)))
+                    self.end_headers()
+                    self.wfile.write(body)
+
+            self._server = ThreadingHTTPServer((host, port), Handler)
+            self._server.daemon_threads = True
+            threading.Thread(target=self._server.serve_forever, daemon=True).start()
+
+
+def timed(stage: str):
+    """
+    Decorator timing every call of the function as a pipeline stage
+    """
+    def decorator(fn):
+        @wraps(fn)
+        def wrapper(*args, **kwargs):
+            if not metrics.enabled and _current_trace.get() is None:
+                return fn(*args, **kwargs)
+            with metrics.timer(stage):
+                return fn(*args, **kwargs)
+        return wrapper
+    return decorator
+
+
+# Create a global metrics registry
+metrics = Metrics(config.METRICS_ENABLED)
@@ -0,0 +1,121 @@
+import hashlib
+import io
+import multiprocessing
+import threading
+from collections import OrderedDict
+from concurrent.futures import ProcessPoolExecutor
+from typing import Iterator, List, Optional
+from config import config
+from metrics import metrics, timed
+
+
+class _TextCache:
+    """
+    Small thread-safe LRU cache of extracted text keyed by file content hash
+    """
+
+    def __init__(self, max_entries: int):
+        self.max_entries = max_entries
+        self._entries: 'OrderedDict[str, str]' = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, digest: str) -> Optional[str]:
+        with self._lock:
+            text = self._entries.get(digest)
+            if text is not None:
+                self._entries.move_to_end(digest)
+            return text
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+
+    def set(self, digest: str, text: str):
+        with self._lock:
+            self._entries[digest] = text
+            self._entries.move_to_end(digest)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+
+_text_cache = _TextCache(config.PDF_CACHE_MAX_ENTRIES)
+_pool: Optional[ProcessPoolExecutor] = None
+_pool_lock = threading.Lock()
+
+
+def _get_pool() -> ProcessPoolExecutor:
+    global _pool
+    with _pool_lock:
+        if _pool is None:
+            # spawn rather than fork: the Streamlit server is multi-threaded
+            _pool = ProcessPoolExecutor(max_workers=config.PDF_WORKERS,
+                                        mp_context=multiprocessing.get_context('spawn'))
+        return _pool
+
+
+def _reader(data: bytes):
+    # PyPDF2 takes longer to import than the rest of the pipeline together, so it is
+    # only loaded once a PDF actually needs parsing
+    import PyPDF2
+    return PyPDF2.PdfReader(io.BytesIO(data))
+
+
+def _page_text(page) -> str:
+    return (page.extract_text() or "") + "\n"
+
+
+def _iter_pages(reader) -> Iterator[str]:
+    for page in reader.pages:
+        yield _page_text(page)
+
+
+def _extract_page_range(data: bytes, start: int, stop: int) -> List[str]:
+    reader = _reader(data)
+    return [_page_text(reader.pages[i]) for i in range(start, stop)]
+
+
+def clear_extraction_cache():
+    """
+    Drop every cached extraction result
+    """
+    _text_cache.clear()
+
+
+def iter_pdf_pages(data: bytes) -> Iterator[str]:
+    """
+    Yield the text of each page (with its trailing newline) as soon as it is parsed
+    """
+    yield from _iter_pages(_reader(data))
+
+
+@timed('pdf_extraction')
+def extract_pdf_text(data: bytes, workers: Optional[int] = None) -> str:
+    """
+    Extract the text of a PDF given its raw bytes.
+
+    Results are cached by content hash, so reruns and re-uploads of the same file are
+    free. PDFs with at least PDF_PARALLEL_MIN_PAGES pages are split into page ranges
+    and extracted across worker processes; pass workers=1 to stay in-process.
+    """
+    digest = hashlib.sha256(data).hexdigest()
+    cached = _text_cache.get(digest)
+    if cached is not None:
+        metrics.increment('pdf_cache_requests_total', result='hit')
+        return cached
+    metrics.increment('pdf_cache_requests_total', result='miss')
+
+    workers = workers or config.PDF_WORKERS
+    # Parsed once here; worker processes for large PDFs parse their own copy
+    reader = _reader(data)
+    page_count = len(reader.pages)
+    if workers > 1 and page_count >= config.PDF_PARALLEL_MIN_PAGES:
+        chunk_size = -(-page_count // workers)
+        ranges = [(start, min(start + chunk_size, page_count)) for start in range(0, page_count, chunk_size)]
+        pool = _get_pool()
+        futures = [pool.submit(_extract_page_range, data, start, stop) for start, stop in ranges]
+        text = "".join(page for future in futures for page in future.result())
+    else:
+        text = "".join(_iter_pages(reader))
+
+    _text_cache.set(digest, text)
+    return text
@@ -0,0 +1,205 @@
+"""
+Rank many resumes against a job description and shortlist the best matches.
+
+Usage:
+    python ranking.py resumes/ --job "Data Scientist" --job-description jd.txt --top 20
+    python ranking.py resumes/ --job "Data Scientist" --top 20 --llm --output shortlist.jsonl
+"""
+import argparse
+import asyncio
+import json
+import math
+import re
+import sys
+from collections import Counter
+from concurrent.futures import ProcessPoolExecutor
+from typing import Dict, Iterable, List, Optional, Sequence, Tuple
+import numpy as np
+from scipy import sparse
+from result_model import SkillSet
+from skill_matcher import skill_matcher
+
+_TOKEN = re.compile(r'[a-z0-9][a-z0-9+#.]*[a-z0-9+#]|[a-z0-9]')
+_SKILL_PREFIX = 'skill:'
+
+
+def tokenize(text: str) -> List[str]:
+    """
+    Lowercase word tokens, keeping technical forms like 'c++', 'c#' and 'node.js'
+    """
+    return _TOKEN.findall(text.lower())
+
+
+class CandidateRanker:
+    """
+    TF-IDF ranking of resumes against a job description.
+
+    Each resume becomes a sparse row combining sublinear TF-IDF weights for its words
+    with a feature per extracted skill (scaled by skill_weight). Rows are L2
+    normalized, so scoring every resume against a job is one sparse matrix-vector
+    product, and each skill's contribution to a score can be read straight off it.
+    """
+
+    def __init__(self, skill_weight: float = 3.0):
+        self.skill_weight = skill_weight
+        self.ids: List[str] = []
+        self.skill_sets: List[SkillSet] = []
+        self.vocabulary: Dict[str, int] = {}
+        self.idf: Optional[np.ndarray] = None
+        self.matrix: Optional[sparse.csr_matrix] = None
+
+    def _features(self, text: str, skills: Iterable[str]) -> Counter:
+        counts = Counter(tokenize(text))
+        for skill in skills:
+            counts[_SKILL_PREFIX + skill] = 1
+        return counts
+
+    def _weight(self, feature: str, count: int) -> float:
+        if feature.startswith(_SKILL_PREFIX):
+            return self.skill_weight
+        return 1.0 + math.log(count)
+
+    def fit(self, resumes: Sequence[Tuple[str, str, Iterable[str]]]) -> 'CandidateRanker':
+        """
+        Index (id, resume_text, skills) triples
+        """
+        self.ids = []
+        self.skill_sets = []
+        self.vocabulary = {}
+        indptr = [0]
+        indices: List[int] = []
+        data: List[float] = []
+        for resume_id, text, skills in resumes:
+            self.ids.append(resume_id)
+            skills = list(skills)
+            self.skill_sets.append(SkillSet.from_names(skills))
+            for feature, count in self._features(text, skills).items():
+                index = self.vocabulary.setdefault(feature, len(self.vocabulary))
+                indices.append(index)
+                data.append(self._weight(feature, count))
+            indptr.append(len(indices))
+
+        shape = (len(self.ids), len(self.vocabulary))
+        matrix = sparse.csr_matrix((np.array(data, dtype=np.float64), np.array(indices, dtype=np.int64),
+                                    np.array(indptr, dtype=np.int64)), shape=shape)
+
+        document_frequency = np.bincount(matrix.indices, minlength=shape[1])
+        self.idf = np.log((1 + shape[0]) / (1 + document_frequency)) + 1.0
+        matrix = matrix.multiply(self.idf).tocsr()
+
+        norms = np.sqrt(np.asarray(matrix.multiply(matrix).sum(axis=1)).ravel())
+        norms[norms == 0] = 1.0
+        self.matrix = sparse.diags(1.0 / norms).dot(matrix).tocsr()
+        return self
+
+    def _query_vector(self, job_description: str, skills: Iterable[str]) -> np.ndarray:
+        query = np.zeros(len(self.vocabulary))
+        for feature, count in self._features(job_description, skills).items():
+            index = self.vocabulary.get(feature)
+            if index is not None:
+                query[index] = self._weight(feature, count) * self.idf[index]
+        norm = np.linalg.norm(query)
+        return query / norm if norm else query
+
+    def rank(self, job_description: str, top_k: int = 10, required_skills: Optional[Iterable[str]] = None) -> List[Dict]:
+        """
+        Return the top_k resumes for a job description, best first, with per-skill
+        contributions to each score, the required skills each lacks and the fraction
+        it covers. Required skills default to those found in the job description.
+        """
+        if self.matrix is None or not self.ids:
+            return []
+        required = sorted(set(required_skills) if required_skills is not None
+                          else skill_matcher.find_skills(job_description))
+        query = self._query_vector(job_description, required)
+        scores = self.matrix.dot(query)
+
+        top_k = min(top_k, len(self.ids))
+        top = np.argpartition(-scores, top_k - 1)[:top_k]
+        top = top[np.argsort(-scores[top], kind='stable')]
+
+        required_set = SkillSet.from_names(required)
+        skill_columns = [(skill, self.vocabulary.get(_SKILL_PREFIX + skill)) for skill in required]
+        shortlist = []
+        for row in top:
+            skills = self.skill_sets[row]
+            contributions = {}
+            for skill, column in skill_columns:
+                value = self.matrix[row, column] * query[column] if column is not None else 0.0
+                if value > 0:
+                    contributions[skill] = round(float(value), 4)
+            shortlist.append({
+                'id': self.ids[row],
+                'score': round(float(scores[row]), 4),
+                'skill_contributions': dict(sorted(contributions.items(), key=lambda item: -item[1])),
+                'missing_skills': sorted(required_set - skills),
+                'skill_coverage': round(skills.overlap(required_set), 4),
+            })
+        return shortlist
+
+
+def _load_resume(path: str) -> Tuple[str, str, List[str], Optional[str]]:
+    """
+    (path, text, skills, error) for one resume. Runs inside a worker process, so
+    errors are returned rather than raised and one bad file does not stop the run.
+    """
+    from batch_analyzer import read_resume_text
+    from analyzer_core import extract_skills
+
+    try:
+        text = read_resume_text(path)
+        if not text.strip():
+            return path, '', [], "No text could be extracted"
+        return path, text, extract_skills(text), None
+    except Exception as e:
+        return path, '', [], f"{type(e).__name__}: {str(e)}"
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description="Shortlist resumes for a job before running the LLM analysis")
+    parser.add_argument('source', help="Directory of PDF/text resumes, or a manifest file with one path per line")
+    parser.add_argument('--job', required=True, help="Target job role")
+    parser.add_argument('--job-description', help="File with the full job description")
+    parser.add_argument('--top', type=int, default=10, help="Number of candidates to shortlist")
+    parser.add_argument('--workers', type=int, help="Worker processes for extraction (default: number of CPU cores)")
+    parser.add_argument('--llm', action='store_true', help="Run the LLM analysis on the shortlist")
+    parser.add_argument('--output', help="Write the shortlist as JSONL instead of printing it")
+    args = parser.parse_args(argv)
+
+    from batch_analyzer import iter_resume_paths
+
+    job_description = args.job
+    if args.job_description:
+        with open(args.job_description, encoding='utf-8') as f:
+            job_description += "\n" + f.read()
+
+    resumes = []
+    with ProcessPoolExecutor(max_workers=args.workers) as executor:
+        for path, text, skills, error in executor.map(_load_resume, iter_resume_paths(args.source), chunksize=16):
+            if error:
+                print(f"Skipping {path}: {error}", file=sys.stderr)
+            else:
+                resumes.append((path, text, skills))
+
+    shortlist = CandidateRanker().fit(resumes).rank(job_description, top_k=args.top)
+
+    if args.llm and shortlist:
+        from analyzer_core import analyze_many
+
+        texts = {resume_id: text for resume_id, text, _ in resumes}
+        analyses = asyncio.run(analyze_many([(texts[entry['id']], args.job) for entry in shortlist]))
+        for entry, analysis in zip(shortlist, analyses):
+            entry['analysis'] = analysis
+
+    output = open(args.output, 'w', encoding='utf-8') if args.output else sys.stdout
+    try:
+        for entry in shortlist:
+            output.write(json.dumps(entry) + '\n')
+    finally:
+        if args.output:
+            output.close()
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,237 @@
+import hashlib
+import json
+import struct
+import sys
+from dataclasses import dataclass
+from typing import Dict, Iterable, Iterator, List, Optional, Sequence, Tuple
+from candidate_index import degree_level
+from skill_matcher import skill_matcher
+
+# Serialized layout (little endian):
+#   header      magic 'RAR2', vocabulary fingerprint (8 bytes), bitset length (I),
+#               extra skill count (I), education count (I), experience count (I),
+#               target job length (I), analysis length (I)
+#   body        skill bitset bytes, target job, then every string as a (I) length +
+#               UTF-8 bytes, one degree level byte per education entry, then the
+#               analysis as JSON
+_MAGIC = b'RAR2'
+_HEADER = struct.Struct('<4s8sIIIIII')
+_LENGTH = struct.Struct('<I')
+
+
+class SkillVocabulary:
+    """
+    Canonical skills from the taxonomy, each interned to a stable integer id
+    (its position in the taxonomy file).
+    """
+
+    def __init__(self, skills: Sequence[str]):
+        self.skills: Tuple[str, ...] = tuple(sys.intern(skill) for skill in skills)
+        self.ids: Dict[str, int] = {skill.lower(): index for index, skill in enumerate(self.skills)}
+        # Serialized bitsets are only meaningful against the same vocabulary
+        self.fingerprint = hashlib.sha256('\n'.join(self.skills).encode('utf-8')).digest()[:8]
+
+
+vocabulary = SkillVocabulary(skill_matcher.skills)
+
+
+class SkillSet:
+    """
+    Immutable set of skills: taxonomy skills as bits of one int, anything else
+    (free-form entries from the skills section) as a tuple of interned strings.
+    Intersections, unions and differences between taxonomy skills are single
+    big-int operations.
+    """
+
+    __slots__ = ('bits', 'extra')
+
+    def __init__(self, bits: int = 0, extra: Tuple[str, ...] = ()):
+        self.bits = bits
+        self.extra = extra
+
+    @classmethod
+    def from_names(cls, names: Iterable[str]) -> 'SkillSet':
+        bits = 0
+        extra = {}
+        for name in names:
+            skill_id = vocabulary.ids.get(name.lower())
+            if skill_id is not None:
+                bits |= 1 << skill_id
+            else:
+                extra.setdefault(name.lower(), sys.intern(name))
+        return cls(bits, tuple(sorted(extra.values(), key=str.lower)))
+
+    def ids(self) -> Iterator[int]:
+        bits = self.bits
+        while bits:
+            low = bits & -bits
+            yield low.bit_length() - 1
+            bits ^= low
+
+    def __iter__(self) -> Iterator[str]:
+        for skill_id in self.ids():
+            yield vocabulary.skills[skill_id]
+        yield from self.extra
+
+    def __len__(self) -> int:
+        return bin(self.bits).count('1') + len(self.extra)
+
+    def __contains__(self, name: str) -> bool:
+        skill_id = vocabulary.ids.get(name.lower())
+        if skill_id is not None:
+            return bool(self.bits >> skill_id & 1)
+        return any(extra.lower() == name.lower() for extra in self.extra)
+
+    def __eq__(self, other) -> bool:
+        return isinstance(other, SkillSet) and self.bits == other.bits and \
+            {s.lower() for s in self.extra} == {s.lower() for s in other.extra}
+
+    def __hash__(self) -> int:
+        return hash((self.bits, frozenset(s.lower() for s in self.extra)))
+
+    def __repr__(self) -> str:
+        return f"SkillSet({list(self)!r})"
+
+    def _extra_op(self, other: 'SkillSet', keep_shared: bool) -> Tuple[str, ...]:
+        other_extra = {s.lower() for s in other.extra}
+        return tuple(s for s in self.extra if (s.lower() in other_extra) == keep_shared)
+
+    def __and__(self, other: 'SkillSet') -> 'SkillSet':
+        return SkillSet(self.bits & other.bits, self._extra_op(other, True))
+
+    def __or__(self, other: 'SkillSet') -> 'SkillSet':
+        return SkillSet(self.bits | other.bits, self.extra + other._extra_op(self, False))
+
+    def __sub__(self, other: 'SkillSet') -> 'SkillSet':
+        return SkillSet(self.bits & ~other.bits, self._extra_op(other, False))
+
+    def common_count(self, other: 'SkillSet') -> int:
+        """
+        Number of skills in both sets, without building the intersection
+        """
+        count = bin(self.bits & other.bits).count('1')
+        if self.extra and other.extra:
+            count += len(self._extra_op(other, True))
+        return count
+
+    def overlap(self, required: 'SkillSet') -> float:
+        """
+        Fraction of the required skills this set covers (1.0 when nothing is required)
+        """
+        needed = len(required)
+        return self.common_count(required) / needed if needed else 1.0
+
+    def to_list(self) -> List[str]:
+        return list(self)
+
+
+@dataclass(frozen=True)
+class EducationRecord:
+    __slots__ = ('text', 'level')
+    text: str
+    # 0 unknown, 1 bachelor's, 2 master's, 3 doctorate
+    level: int
+
+    @classmethod
+    def from_text(cls, text: str) -> 'EducationRecord':
+        return cls(sys.intern(text), degree_level([text]))
+
+    def __str__(self) -> str:
+        return self.text
+
+
+@dataclass(frozen=True)
+class ExperienceRecord:
+    __slots__ = ('text',)
+    # 'Role at Company' line, as produced by extract_work_experience
+    text: str
+
+    @classmethod
+    def from_text(cls, text: str) -> 'ExperienceRecord':
+        return cls(sys.intern(text))
+
+    def __str__(self) -> str:
+        return self.text
+
+
+@dataclass
+class AnalysisResult:
+    """
+    Compact form of one resume's extraction results (and LLM analysis, once known)
+    """
+    __slots__ = ('skills', 'education', 'work_experience', 'target_job', 'analysis')
+    skills: SkillSet
+    education: Tuple[EducationRecord, ...]
+    work_experience: Tuple[ExperienceRecord, ...]
+    target_job: str
+    analysis: Optional[Dict]
+
+    @classmethod
+    def from_extracted(cls, skills: Iterable[str], education: Iterable[str], work_experience: Iterable[str],
+                       target_job: str = '', analysis: Optional[Dict] = None) -> 'AnalysisResult':
+        return cls(SkillSet.from_names(skills),
+                   tuple(EducationRecord.from_text(entry) for entry in education),
+                   tuple(ExperienceRecord.from_text(entry) for entry in work_experience),
+                   sys.intern(target_job), analysis)
+
+    def to_dict(self) -> Dict:
+        """
+        Plain lists and strings, as returned by the extract_* functions
+        """
+        return {
+            'skills': self.skills.to_list(),
+            'education': [str(entry) for entry in self.education],
+            'work_experience': [str(entry) for entry in self.work_experience],
+            'target_job': self.target_job,
+            'analysis': self.analysis,
+        }
+
+    def to_bytes(self) -> bytes:
+        bits = self.skills.bits.to_bytes((self.skills.bits.bit_length() + 7) // 8, 'little')
+        analysis = json.dumps(self.analysis, separators=(',', ':')).encode('utf-8') if self.analysis is not None else b''
+        strings = list(self.skills.extra) + [entry.text for entry in self.education] + \
+            [entry.text for entry in self.work_experience]
+        target_job = self.target_job.encode('utf-8')
+        parts = [_HEADER.pack(_MAGIC, vocabulary.fingerprint, len(bits), len(self.skills.extra),
+                              len(self.education), len(self.work_experience), len(target_job), len(analysis)),
+                 bits, target_job]
+        for string in strings:
+            encoded = string.encode('utf-8')
+            parts += [_LENGTH.pack(len(encoded)), encoded]
+        parts += [bytes(entry.level for entry in self.education), analysis]
+        return b''.join(parts)
+
+    @classmethod
+    def from_bytes(cls, data) -> 'AnalysisResult':
+        """
+        Decode to_bytes() output; accepts bytes or a memoryview without copying it
+        """
+        view = memoryview(data)
+        magic, fingerprint, bits_length, extra_count, education_count, experience_count, job_length, \
+            analysis_length = _HEADER.unpack_from(view, 0)
+        if magic != _MAGIC:
+            raise ValueError("Not a serialized AnalysisResult")
+        if fingerprint != vocabulary.fingerprint:
+            raise ValueError("AnalysisResult was serialized with a different skill taxonomy")
+        offset = _HEADER.size
+        bits = int.from_bytes(view[offset:offset + bits_length], 'little')
+        offset += bits_length
+        target_job = sys.intern(str(view[offset:offset + job_length], 'utf-8'))
+        offset += job_length
+
+        def read_string() -> str:
+            nonlocal offset
+            (length,) = _LENGTH.unpack_from(view, offset)
+            offset += _LENGTH.size
+            value = str(view[offset:offset + length], 'utf-8')
+            offset += length
+            return value
+
+        extra = tuple(sys.intern(read_string()) for _ in range(extra_count))
+        education_texts = [read_string() for _ in range(education_count)]
+        experience = tuple(ExperienceRecord(sys.intern(read_string())) for _ in range(experience_count))
+        education = tuple(EducationRecord(sys.intern(text), level)
+                          for text, level in zip(education_texts, view[offset:offset + education_count]))
+        offset += education_count
+        analysis = json.loads(str(view[offset:offset + analysis_length], 'utf-8')) if analysis_length else None
+        return cls(SkillSet(bits, extra), education, experience, target_job, analysis)
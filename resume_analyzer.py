@@ -1,288 +1,214 @@
 import streamlit as st
-import PyPDF2
-import re
-import os
-from typing import Dict, List, Optional
-import requests
-import json
+import logging
+from typing import Dict, Optional
 from config import config
+from metrics import RequestTrace, metrics
+from candidate_index import DEGREE_NAMES, CandidateIndex, QuerySyntaxError
+from jobs import CANCELLED, DONE, QUEUED, Job, JobManager, QueueFullError
+from result_model import AnalysisResult
+from pdf_extractor import extract_pdf_text
+from llm_cache import llm_cache
+from analyzer_core import SUGGESTION_SECTIONS, fallback_analysis, run_analysis_job, trace_if
+from revisions import RevisionDiff, diff_revisions, extract_revision
 
-# Set up the Streamlit page configuration
-st.set_page_config(
-    page_title="Resume Analyzer AI Agent",
-    page_icon="📄",
-    layout="wide"
-)
-
-# Initialize session state for storing results
-if 'analysis_results' not in st.session_state:
-    st.session_state.analysis_results = None
+logger = logging.getLogger(__name__)
 
 def extract_text_from_pdf(pdf_file) -> str:
     """
-    Extract text from a PDF file using PyPDF2
+    Extract text from a PDF file using PyPDF2.
+    Extraction is cached by file content, so Streamlit reruns do not re-parse the upload.
     """
     try:
         # Reset file pointer to beginning
         pdf_file.seek(0)
-        pdf_reader = PyPDF2.PdfReader(pdf_file)
-        text = ""
-        for page in pdf_reader.pages:
-            text += page.extract_text() + "\n"
-        return text
+        return extract_pdf_text(pdf_file.read())
     except Exception as e:
         st.error(f"Error reading PDF: {str(e)}")
         return ""
 
-def extract_skills(text: str) -> List[str]:
+@st.cache_resource
+def get_job_manager() -> JobManager:
     """
-    Extract skills from the resume text
+    One bounded pool of analysis workers shared by every session in this process
     """
-    # Comprehensive list of technical and soft skills
-    technical_skills = [
-        # Programming languages
-        'Python', 'Java', 'JavaScript', 'C++', 'C#', 'SQL', 'R', 'Go', 'Ruby', 'PHP', 'Swift', 'Kotlin', 'TypeScript',
-        # Frameworks and libraries
-        'React', 'Angular', 'Vue', 'Node.js', 'Django', 'Flask', 'Spring', 'TensorFlow', 'PyTorch', 'Pandas', 'Numpy',
-        'Express', 'Ruby on Rails', 'Laravel', 'ASP.NET', 'React Native', 'Flutter',
-        # Tools and platforms
-        'AWS', 'Azure', 'GCP', 'Docker', 'Kubernetes', 'Git', 'Jenkins', 'CI/CD', 'Agile', 'Scrum', 'JIRA', 'Trello',
-        'Linux', 'Unix', 'Windows', 'MacOS', 'MySQL', 'PostgreSQL', 'MongoDB', 'Oracle',
-        # Soft skills
-        'Project Management', 'Leadership', 'Communication', 'Teamwork', 'Problem Solving', 'Analytical Skills',
-        'Time Management', 'Critical Thinking', 'Creativity', 'Adaptability', 'Emotional Intelligence',
-        # Specialized areas
-        'Machine Learning', 'Deep Learning', 'Artificial Intelligence', 'Data Science', 'Data Analysis',
-        'Web Development', 'Mobile Development', 'DevOps', 'Cybersecurity', 'Cloud Computing', 'Blockchain',
-        'UI/UX', 'Frontend', 'Backend', 'Full Stack', 'API Development', 'Database Design'
-    ]
-    
-    skills = set()
-    
-    # Check for each skill in the text
-    for skill in technical_skills:
-        # Case-insensitive search for the skill
-        if re.search(r'\b' + re.escape(skill) + r'\b', text, re.IGNORECASE):
-            skills.add(skill)
-    
-    # Additional skills from common sections
-    # Look for skills section
-    skills_section = re.search(r'(skills|technologies|expertise)[:\s\n](.*?)(\n\n|\n[A-Z][a-z]+:|$)', text, re.IGNORECASE | re.DOTALL)
-    if skills_section:
-        skills_text = skills_section.group(2)
-        # Extract individual skills (comma-separated)
-        individual_skills = re.split(r'[,;]', skills_text)
-        for skill in individual_skills:
-            skill = skill.strip().strip('-').strip()
-            if len(skill) > 2:  # Filter out very short entries
-                # Check if the skill is in our known list or looks like a skill
-                if skill in technical_skills or len(skill.split()) <= 3:
-                    skills.add(skill)
-    
-    return list(skills)
+    return JobManager(config.ANALYSIS_WORKERS, config.ANALYSIS_MAX_QUEUED)
 
-def extract_education(text: str) -> List[str]:
+@st.cache_resource
+def get_candidate_index() -> CandidateIndex:
     """
-    Extract education information from the resume text
+    The persistent candidate index, opened once per process
     """
-    education = set()
-    
-    # Comprehensive list of education-related terms
-    education_keywords = [
-        'Bachelor', 'Master', 'PhD', 'Doctorate', 'Degree', 'B.Sc', 'M.Sc', 'B.Tech', 'M.Tech',
-        'B.A.', 'M.A.', 'B.Com', 'M.Com', 'BBA', 'MBA', 'B.E.', 'M.E.', 'B.Eng', 'M.Eng',
-        'Associate', 'Diploma', 'Certification', 'Certified', 'Certificate', 'Coursework',
-        'University', 'College', 'Institute', 'School', 'Academy', 'Campus'
-    ]
-    
-    # Look for education section
-    education_section = re.search(r'(education|academic background|qualifications)[:\s\n](.*?)(\n\n|\n[A-Z][a-z]+:|$)', text, re.IGNORECASE | re.DOTALL)
-    if education_section:
-        education_text = education_section.group(2)
-        
-        # Extract degree and institution details
-        # Pattern: Degree followed by field and institution
-        degree_patterns = [
-            r'([A-Z][a-z]+(?:\s+[A-Z][a-z]+)*)\s*(?:in|at)?\s*([A-Z][a-z]+(?:\s+[A-Z][a-z]+)*)\s*(?:at|from)?\s*([A-Z][A-Za-z\s]+University|College|Institute)',
-            r'(Bachelor|Master|PhD|B\.[A-Z]+|M\.[A-Z]+|B\.Tech|M\.Tech)[\w\s,.\-&()]*?(University|College|Institute)?[\w\s,.\-&()]*',
-        ]
-        
-        for pattern in degree_patterns:
-            matches = re.findall(pattern, education_text, re.IGNORECASE)
-            for match in matches:
-                if isinstance(match, tuple):
-                    # Combine all non-empty parts of the match
-                    edu_info = ' '.join([part for part in match if part.strip()])
-                    if edu_info:
-                        education.add(edu_info.strip())
-                else:
-                    education.add(match.strip())
-    
-    # If no education section found, look for education keywords throughout the text
-    if not education:
-        for keyword in education_keywords:
-            matches = re.findall(r'\b' + re.escape(keyword) + r'[\w\s,.\-&()]{0,100}?([A-Z][a-z\s]{5,50}?)(University|College|Institute|School)', text, re.IGNORECASE)
-            for match in matches:
-                if isinstance(match, tuple):
-                    education.add(f"{match[0]} {match[1]}")
-                else:
-                    education.add(match)
-    
-    return list(education)
+    return CandidateIndex(config.CANDIDATE_INDEX_PATH)
 
-def extract_work_experience(text: str) -> List[str]:
+def save_to_candidate_index(results: Dict):
     """
-    Extract work experience from the resume text
+    Store an analyzed resume so it can be searched later
     """
-    experiences = set()
-    
-    # Look for work experience section
-    exp_section = re.search(r'(work experience|professional experience|employment history|career history|professional background)[:\s\n](.*?)(\n\n|\n[A-Z][a-z]+:|$)', text, re.IGNORECASE | re.DOTALL)
-    if exp_section:
-        exp_text = exp_section.group(2)
-        
-        # Extract company names and positions
-        # Pattern: Company - Position or Company, Position
-        company_position_patterns = [
-            r'([A-Z][A-Za-z\s&.,\-()]+(?:Inc\.?|Ltd\.?|LLC|Corp\.?|Group)?)\s*[-,]\s*([A-Z][a-z\s]{5,40})',
-            r'([A-Z][A-Za-z\s&.,\-()]+(?:Inc\.?|Ltd\.?|LLC|Corp\.?|Group)?).{0,20}(?:at|@)\s*([A-Z][a-z\s]{5,40})',
-            r'([A-Z][a-z\s]{5,40})\s*(?:at|@)\s*([A-Z][A-Za-z\s&.,\-()]+(?:Inc\.?|Ltd\.?|LLC|Corp\.?|Group)?)',
-        ]
-        
-        for pattern in company_position_patterns:
-            matches = re.findall(pattern, exp_text, re.IGNORECASE)
-            for match in matches:
-                if len(match) >= 2:
-                    # Determine which part is company and which is position
-                    # Usually the longer string or the one containing 'Inc', 'Ltd', etc. is the company
-                    part1, part2 = match[0].strip(), match[1].strip()
-                    
-                    # Check if part1 looks like a company (contains company suffix or is longer)
-                    if re.search(r'(Inc\.?|Ltd\.?|LLC|Corp\.?|Group)', part1, re.IGNORECASE) or len(part1) > len(part2):
-                        experiences.add(f"{part2} at {part1}")
-                    else:
-                        experiences.add(f"{part1} at {part2}")
+    try:
+        record = results['result'].to_dict()
+        record.update(source=CandidateIndex.source_for_text(results['resume_text']), resume_text=results['resume_text'])
+        get_candidate_index().add(record)
+    except Exception as e:
+        # Indexing is a convenience and must never hide the analysis
+        logger.warning("Could not save the analysis to the candidate index: %s", e)
+
+def show_candidate_search():
+    """
+    Search previously analyzed resumes by skills, degree and keywords
+    """
+    with st.expander("🔎 Search saved candidates", expanded=False):
+        col1, col2 = st.columns([3, 1])
+        with col1:
+            query = st.text_input("Skills", placeholder="e.g. Kubernetes AND (Go OR Rust) AND NOT PHP",
+                                  help="Combine skills with AND, OR, NOT and parentheses")
+            keywords = st.text_input("Keywords", placeholder="Full text search over the indexed resumes")
+        with col2:
+            min_degree = st.selectbox("Minimum degree", list(DEGREE_NAMES))
+            page = st.number_input("Page", min_value=1, value=1, step=1)
+        if not (query or keywords or min_degree != 'any'):
+            return
+        try:
+            found = get_candidate_index().search(query, min_degree, keywords, page=int(page), page_size=20)
+        except QuerySyntaxError as e:
+            st.error(f"Invalid search: {str(e)}")
+            return
+        st.caption(f"{found['total']} candidates, page {found['page']} of {max(found['pages'], 1)}")
+        if found['results']:
+            st.dataframe([{
+                'Source': result['source'],
+                'Target job': result['target_job'],
+                'Skills': ', '.join(result['skills']),
+                'Education': '; '.join(result['education']),
+                'Experience': '; '.join(result['work_experience'])
+            } for result in found['results']])
+
+def collect_job_result(results: Dict, job: Job):
+    """
+    Move a finished job's outcome into the session's analysis results
+    """
+    result = results['result']
+    if job.status == DONE:
+        result.analysis = job.result['analysis']
+        results['role_analyses'] = job.result['role_analyses']
+        results['messages'] = job.result['messages']
+        results['incremental'] = job.result['incremental']
+        # Remember clean single-role analyses so the next revision can be analyzed incrementally
+        revision = st.session_state.get('resume_revision')
+        if revision is not None and not results['messages'] and not results['role_analyses']:
+            revision.set_analysis(result.target_job, result.analysis)
+        if results.get('save_to_index'):
+            save_to_candidate_index(results)
+        # The full text is only needed for indexing; don't keep it for the rest of the session
+        results.pop('resume_text', None)
+    elif job.status == CANCELLED:
+        result.analysis = {key: job.partial.get(key, []) for key, _ in SUGGESTION_SECTIONS}
+        results['messages'] = [('info', "Analysis cancelled. Showing any suggestions received before it stopped.")]
+    else:
+        metrics.increment('llm_failures_total', reason='job_failed')
+        logger.warning("Analysis job %s failed: %s", job.id, job.error)
+        result.analysis = fallback_analysis()
+        results['messages'] = [('error', f"Error in LLM analysis: {job.error}")]
+    results['job_id'] = None
+
+@st.fragment(run_every=config.ANALYSIS_POLL_INTERVAL)
+def show_job_progress(job_id: str):
+    """
+    Poll a background analysis, showing its status and any suggestions streamed so far.
+    Reruns the whole page once the job has finished.
+    """
+    manager = get_job_manager()
+    job = manager.get(job_id)
+    if job is None or job.finished:
+        st.rerun()
     
-    # Alternative pattern for finding job titles and companies throughout the text
-    job_patterns = [
-        r'([A-Z][A-Za-z\s]{5,30})\s*(?:at|@)\s*([A-Z][A-Za-z\s&.,\-()]+(?:Inc\.?|Ltd\.?|LLC|Corp\.?|Group)?)',
-        r'([A-Z][A-Za-z\s&.,\-()]+(?:Inc\.?|Ltd\.?|LLC|Corp\.?|Group)?)\s*(?:-|,)\s*([A-Z][A-Za-z\s]{5,30})',
-    ]
+    if job.status == QUEUED:
+        ahead = manager.queue_position(job_id)
+        st.info(f"Waiting for a free analyzer ({ahead} {'analysis' if ahead == 1 else 'analyses'} ahead of yours)...")
+    else:
+        st.info(f"Analyzing your resume... {job.elapsed():.0f}s")
+    for key, title in SUGGESTION_SECTIONS:
+        items = job.partial.get(key)
+        if items:
+            with st.expander(title, expanded=True):
+                st.markdown("\n".join(f"- {item}" for item in items))
+    if st.button("Cancel analysis", key=f"cancel_{job_id}"):
+        manager.cancel(job_id)
+        st.rerun()
+
+def fit_score(analysis: Dict) -> Optional[float]:
+    """
+    The model's 0-100 fit score for a role, if it gave a usable one
+    """
+    try:
+        return max(0.0, min(100.0, float(analysis.get('fit_score'))))
+    except (TypeError, ValueError):
+        return None
+
+def show_role_comparison(role_analyses: Dict[str, Dict]):
+    """
+    Compare how well the resume fits each target role, best fit first
+    """
+    st.subheader("Role Comparison")
+    ranked = sorted(role_analyses.items(), key=lambda item: -(fit_score(item[1]) or -1))
+    st.dataframe([{
+        'Role': role,
+        'Fit score': fit_score(analysis),
+        'Strengths': len(analysis.get('strengths', [])),
+        'Improvements': len(analysis.get('improvements', [])),
+        'Missing skills': ', '.join(analysis.get('missing_skills', []))
+    } for role, analysis in ranked], hide_index=True)
     
-    for pattern in job_patterns:
-        matches = re.findall(pattern, text)
-        for match in matches:
-            if len(match) >= 2:
-                part1, part2 = match[0].strip(), match[1].strip()
-                # Determine which part is company and which is position
-                if re.search(r'(Inc\.?|Ltd\.?|LLC|Corp\.?|Group)', part1, re.IGNORECASE) or len(part1) > len(part2):
-                    experiences.add(f"{part2} at {part1}")
-                else:
-                    experiences.add(f"{part1} at {part2}")
+    best_role, best_analysis = ranked[0]
+    if fit_score(best_analysis) is not None:
+        st.write(f"**Best fit:** {best_role} ({fit_score(best_analysis):.0f}/100)")
     
-    return list(experiences)
+    # Skills missing for every role are the most valuable ones to add
+    missing = [set(analysis.get('missing_skills', [])) for analysis in role_analyses.values()]
+    common = set.intersection(*missing) if missing else set()
+    if common:
+        st.write("**Missing for every role:** " + ", ".join(sorted(common)))
 
-def analyze_resume_with_llm(resume_text: str, target_job: str) -> Dict:
+def show_revision_changes(diff: RevisionDiff):
     """
-    Send resume and job target to LLM for analysis
+    Show what changed since the previously submitted revision of the resume
     """
-    # Check if API key is configured
-    if not config.validate_config():
-        # If no API key, return simulated response
-        analysis = {
-            "strengths": ["Strong technical background in Python and data science", 
-                          "Relevant experience in machine learning projects", 
-                          "Good academic background from reputable institution"],
-            "improvements": ["Add more specific metrics to quantify achievements",
-                             "Include more technical keywords related to target role",
-                             "Improve formatting for better readability"],
-            "missing_skills": ["Cloud platforms (AWS/Azure)", "Containerization (Docker/Kubernetes)", "CI/CD pipelines"],
-            "wording_suggestions": ["Replace 'responsible for' with action verbs like 'developed', 'implemented', 'led'",
-                                    "Quantify achievements with specific numbers and percentages",
-                                    "Use industry-specific keywords that match job descriptions"]
-        }
-        return analysis
-    
-    try:
-        # Create the prompt for the LLM
-        prompt = f"Analyze this resume for the target job role '{target_job}'. \nResume: {resume_text}\n\nPlease provide:\n1. Strengths in the resume relevant to the target role\n2. Areas for improvement\n3. Missing skills for the target role\n4. Wording and formatting suggestions\n\nFormat your response as a JSON object with keys: strengths, improvements, missing_skills, wording_suggestions.\nEach value should be a list of strings."
-        
-        # Use OpenRouter API
-        response = requests.post(
-            url="https://openrouter.ai/api/v1/chat/completions",
-            headers={
-                "Authorization": f"Bearer {config.OPENROUTER_API_KEY}",
-                "Content-Type": "application/json",
-            },
-            data=json.dumps({
-                "model": config.LLM_MODEL,
-                "messages": [
-                    {
-                        "role": "user",
-                        "content": prompt
-                    }
-                ],
-                "temperature": config.TEMPERATURE,
-                "max_tokens": config.MAX_TOKENS,
-                "reasoning": {"enabled": config.REASONING_ENABLED}
-            })
-        )
-        
-        # Check if the request was successful
-        if response.status_code != 200:
-            st.error(f"API request failed with status {response.status_code}: {response.text}")
-            return {
-                "strengths": ["Resume contains relevant technical skills"],
-                "improvements": ["Consider adding more specific examples of achievements"],
-                "missing_skills": ["Additional skills may be needed for your target role"],
-                "wording_suggestions": ["Use action verbs to start each bullet point"]
-            }
-        
-        # Parse the response
-        response_json = response.json()
-        
-        # Check if the response has the expected structure
-        if 'choices' not in response_json:
-            st.error(f"Unexpected API response format: {response_json}")
-            return {
-                "strengths": ["Resume contains relevant technical skills"],
-                "improvements": ["Consider adding more specific examples of achievements"],
-                "missing_skills": ["Additional skills may be needed for your target role"],
-                "wording_suggestions": ["Use action verbs to start each bullet point"]
-            }
-        
-        if not response_json['choices']:
-            st.error("No choices returned in API response")
-            return {
-                "strengths": ["Resume contains relevant technical skills"],
-                "improvements": ["Consider adding more specific examples of achievements"],
-                "missing_skills": ["Additional skills may be needed for your target role"],
-                "wording_suggestions": ["Use action verbs to start each bullet point"]
-            }
-        
-        content = response_json['choices'][0]['message']['content']
-        analysis = json.loads(content)
-        return analysis
-        
-    except json.JSONDecodeError:
-        st.error("Error: LLM response is not in valid JSON format")
-        return {
-            "strengths": ["Resume contains relevant technical skills"],
-            "improvements": ["Consider adding more specific examples of achievements"],
-            "missing_skills": ["Additional skills may be needed for your target role"],
-            "wording_suggestions": ["Use action verbs to start each bullet point"]
-        }
-    except Exception as e:
-        st.error(f"Error in LLM analysis: {str(e)}")
-        # Return a default response if there's an error
-        return {
-            "strengths": ["Resume contains relevant technical skills"],
-            "improvements": ["Consider adding more specific examples of achievements"],
-            "missing_skills": ["Additional skills may be needed for your target role"],
-            "wording_suggestions": ["Use action verbs to start each bullet point"]
-        }
+    st.markdown("**Changes since your last submission:**")
+    if not diff.changes:
+        st.write("No changes.")
+        return
+    for change in diff.changes:
+        st.write(f"- {change.title}: {change.kind}")
+    if diff.skills_added:
+        st.write(f"- Skills added: {', '.join(diff.skills_added)}")
+    if diff.skills_removed:
+        st.write(f"- Skills removed: {', '.join(diff.skills_removed)}")
+
+def show_debug_panel(trace: Dict):
+    """
+    Show the stage timings and counters recorded for the last analysis
+    """
+    with st.expander("Debug: timings and counters", expanded=False):
+        st.caption(f"Total recorded stage time: {trace['total_ms']:.1f} ms")
+        if trace['stages']:
+            st.table(trace['stages'])
+        if trace['counters']:
+            st.table([{'counter': name, 'value': value} for name, value in trace['counters'].items()])
 
 def main():
+    # Set up the Streamlit page configuration
+    st.set_page_config(
+        page_title="Resume Analyzer AI Agent",
+        page_icon="📄",
+        layout="wide"
+    )
+    
+    # Initialize session state for storing results
+    if 'analysis_results' not in st.session_state:
+        st.session_state.analysis_results = None
+    
+    if config.METRICS_PORT:
+        metrics.serve(config.METRICS_PORT)
+    
     st.title("📄 Resume Analyzer AI Agent")
     st.write("Upload your resume and get AI-powered analysis and improvement suggestions")
     
@@ -299,6 +225,27 @@ def main():
         st.header("Supported Formats")
         st.write("- PDF files")
         st.write("- Plain text")
+        
+        st.header("Settings")
+        use_cache = st.checkbox("Reuse cached AI analyses", value=config.LLM_CACHE_ENABLED,
+                                help="Skip the LLM call when the same resume was already analyzed for the same role")
+        if config.LLM_CACHE_ENABLED:
+            cache_stats = llm_cache.stats()
+            st.caption(f"Cache: {cache_stats['hits']} hits, {cache_stats['misses']} misses, {cache_stats['entries']} entries")
+        stream_suggestions = st.checkbox("Stream AI suggestions as they arrive", value=config.LLM_STREAMING)
+        save_to_index = config.CANDIDATE_INDEX_ENABLED and st.checkbox(
+            "Save analyses to the candidate index", value=True,
+            help="Keep the extracted details so the resume can be found from the search below")
+        show_debug = st.checkbox("Show debug timings", value=False,
+                                 help="Record how long each stage of the analysis took")
+        job_stats = get_job_manager().stats()
+        st.caption(f"Analyzer load: {job_stats['running']} running, {job_stats['queued']} queued "
+                   f"(capacity {job_stats['capacity']})")
+    
+    # Trace this run when the debug panel or per-request JSON logs want it
+    tracing = show_debug or config.METRICS_JSON_LOG
+    run_trace = RequestTrace() if tracing else None
+    finished_trace = None
     
     # Main content
     col1, col2 = st.columns(2)
@@ -311,33 +258,63 @@ def main():
         if input_method == "PDF Upload":
             uploaded_file = st.file_uploader("Upload your resume (PDF)", type="pdf")
             if uploaded_file is not None:
-                resume_text = extract_text_from_pdf(uploaded_file)
+                with trace_if(tracing, run_trace):
+                    resume_text = extract_text_from_pdf(uploaded_file)
                 st.success("PDF uploaded and processed successfully!")
         else:
             resume_text = st.text_area("Paste your resume text here:", height=300)
     
     with col2:
         st.header("Target Job Role")
-        target_job = st.text_input("Enter your target job role:", placeholder="e.g., Software Engineer, Data Scientist, Product Manager")
+        compare_roles = st.checkbox("Compare several roles",
+                                    help="Analyze the resume against each role in a single request and compare them")
+        if compare_roles:
+            roles_text = st.text_area("Enter one target job role per line:",
+                                      placeholder="Software Engineer\nData Scientist\nProduct Manager")
+            target_jobs = list(dict.fromkeys(line.strip() for line in roles_text.splitlines() if line.strip()))
+        else:
+            target_job = st.text_input("Enter your target job role:", placeholder="e.g., Software Engineer, Data Scientist, Product Manager")
+            target_jobs = [target_job.strip()] if target_job.strip() else []
     
     # Process button
-    if st.button("Analyze Resume", disabled=(not resume_text or not target_job)):
-        with st.spinner("Analyzing your resume..."):
-            # Extract information
-            skills = extract_skills(resume_text)
-            education = extract_education(resume_text)
-            work_experience = extract_work_experience(resume_text)
-            
-            # Analyze with LLM
-            analysis = analyze_resume_with_llm(resume_text, target_job)
-            
-            # Store results in session state
+    if st.button("Analyze Resume", disabled=(not resume_text or not target_jobs)):
+        with st.spinner("Extracting resume details..."), trace_if(tracing, run_trace):
+            # Extract information, reusing the results of sections unchanged since the last submission
+            previous = st.session_state.get('resume_revision') if config.INCREMENTAL_ANALYSIS else None
+            revision = extract_revision(resume_text, previous)
+            extracted = revision.extracted
+            revision_diff = diff_revisions(previous, revision) if previous is not None else None
+        
+        # Small edits only send the changed sections and the previous analysis to the LLM
+        incremental = {}
+        previous_analysis = previous.analysis_for(target_jobs[0]) if previous is not None and len(target_jobs) == 1 else None
+        if previous_analysis is not None and revision_diff.changed_ratio <= config.INCREMENTAL_MAX_CHANGED_RATIO:
+            incremental = {'previous_analysis': previous_analysis, 'changes': revision_diff.prompt_sections(resume_text)}
+        
+        # Analyze with LLM on the shared worker pool; the AI Suggestions tab polls for the result
+        try:
+            job = get_job_manager().submit(run_analysis_job, resume_text, target_jobs, use_cache, extracted,
+                                           stream_suggestions, run_trace, **incremental)
+        except QueueFullError as e:
+            st.warning(f"The analyzer is busy right now ({e.depth} analyses running or queued). "
+                       "Please try again in a moment.")
+        else:
+            if config.INCREMENTAL_ANALYSIS:
+                st.session_state.resume_revision = revision
+            # Store results in session state; the extraction results and analysis in their compact form
             st.session_state.analysis_results = {
-                'skills': skills,
-                'education': education,
-                'work_experience': work_experience,
-                'analysis': analysis,
-                'target_job': target_job
+                'result': AnalysisResult.from_extracted(extracted['skills'], extracted['education'],
+                                                        extracted['work_experience'], target_jobs[0]),
+                'target_jobs': target_jobs,
+                'role_analyses': None,
+                'resume_text': resume_text,
+                'save_to_index': save_to_index,
+                'job_id': job.id,
+                'trace': run_trace,
+                'messages': [],
+                # Only worth showing when this looks like an edit of the same resume
+                'revision_diff': revision_diff if revision_diff is not None and revision_diff.unchanged else None,
+                'incremental': False
             }
     
     # Display results if available
@@ -345,36 +322,51 @@ def main():
         st.header("📊 Analysis Results")
         
         results = st.session_state.analysis_results
+        result = results['result']
+        if results.get('job_id'):
+            job = get_job_manager().get(results['job_id'])
+            if job is None:
+                results['job_id'] = None
+                results['messages'] = [('warning', "The analysis expired before its result was collected. Please run it again.")]
+            elif job.finished:
+                collect_job_result(results, job)
+                finished_trace = results.get('trace')
         
         # Create tabs for different sections
-        tab1, tab2, tab3, tab4 = st.tabs(["Resume Summary", "Skills", "Education & Experience", "AI Suggestions"])
+        tab_names = ["Resume Summary", "Skills", "Education & Experience", "AI Suggestions"]
+        if results.get('role_analyses'):
+            tab_names.append("Role Comparison")
+        tabs = st.tabs(tab_names)
+        tab1, tab2, tab3, tab4 = tabs[:4]
         
         with tab1:
-            st.subheader(f"Resume Analysis for {results['target_job']}")
+            st.subheader(f"Resume Analysis for {', '.join(results.get('target_jobs') or [result.target_job])}")
             st.markdown("**Extracted Information:**")
-            st.write(f"- **Skills found:** {len(results['skills'])}")
-            st.write(f"- **Education entries:** {len(results['education'])}")
-            st.write(f"- **Work experiences:** {len(results['work_experience'])}")
+            st.write(f"- **Skills found:** {len(result.skills)}")
+            st.write(f"- **Education entries:** {len(result.education)}")
+            st.write(f"- **Work experiences:** {len(result.work_experience)}")
+            if results.get('revision_diff') is not None:
+                show_revision_changes(results['revision_diff'])
         
         with tab2:
             st.subheader("Skills Identified")
-            if results['skills']:
-                for skill in results['skills']:
+            if result.skills:
+                for skill in result.skills:
                     st.write(f"- {skill}")
             else:
                 st.write("No skills identified. Try improving the format of your resume.")
         
         with tab3:
             st.subheader("Education")
-            if results['education']:
-                for edu in results['education']:
+            if result.education:
+                for edu in result.education:
                     st.write(f"- {edu}")
             else:
                 st.write("No education information found.")
             
             st.subheader("Work Experience")
-            if results['work_experience']:
-                for exp in results['work_experience']:
+            if result.work_experience:
+                for exp in result.work_experience:
                     st.write(f"- {exp}")
             else:
                 st.write("No work experience found.")
@@ -382,21 +374,36 @@ def main():
         with tab4:
             st.subheader("AI-Powered Suggestions")
             
-            with st.expander("Strengths", expanded=True):
-                for strength in results['analysis']['strengths']:
-                    st.write(f"- {strength}")
-            
-            with st.expander("Areas for Improvement", expanded=True):
-                for improvement in results['analysis']['improvements']:
-                    st.write(f"- {improvement}")
+            for level, message in results.get('messages', []):
+                getattr(st, level)(message)
             
-            with st.expander("Missing Skills", expanded=True):
-                for missing_skill in results['analysis']['missing_skills']:
-                    st.write(f"- {missing_skill}")
-            
-            with st.expander("Wording & Formatting Suggestions", expanded=True):
-                for suggestion in results['analysis']['wording_suggestions']:
-                    st.write(f"- {suggestion}")
+            if results.get('job_id'):
+                show_job_progress(results['job_id'])
+            elif result.analysis is not None:
+                analysis = result.analysis
+                if results.get('role_analyses'):
+                    role = st.selectbox("Show suggestions for:", list(results['role_analyses']))
+                    analysis = results['role_analyses'][role]
+                if results.get('incremental'):
+                    st.caption("Updated from your previous analysis using only the sections you changed.")
+                for key, title in SUGGESTION_SECTIONS:
+                    with st.expander(title, expanded=True):
+                        for item in analysis.get(key, []):
+                            st.write(f"- {item}")
+        
+        if results.get('role_analyses'):
+            with tabs[4]:
+                show_role_comparison(results['role_analyses'])
+    
+    if config.CANDIDATE_INDEX_ENABLED:
+        show_candidate_search()
+    
+    if finished_trace is not None:
+        st.session_state.debug_trace = finished_trace.as_dict()
+        if config.METRICS_JSON_LOG:
+            metrics.log_trace(finished_trace)
+    if show_debug and st.session_state.get('debug_trace'):
+        show_debug_panel(st.session_state.debug_trace)
 
 if __name__ == "__main__":
     main()
\ No newline at end of file
@@ -0,0 +1,99 @@
+import logging
+import re
+from collections import defaultdict
+from typing import Dict, List
+
+logger = logging.getLogger(__name__)
+
+# Lines that are only a page number, e.g. "3", "Page 2", "Page 2 of 4", "- 2 -"
+_PAGE_NUMBER = re.compile(r'^(?:page\s*)?[-\s]*\d{1,3}(?:\s*(?:of|/)\s*\d{1,3})?[-\s]*$', re.IGNORECASE)
+_HORIZONTAL_SPACE = re.compile(r'[ \t\f\v\u00a0]+')
+
+# Only short lines are treated as running headers/footers
+_MAX_HEADER_LENGTH = 80
+# Copies of a running header/footer are about a page apart; lines repeated closer
+# together (e.g. the same bullet under two jobs) are content
+_MIN_LINES_BETWEEN_HEADERS = 25
+
+
+def estimate_tokens(text: str) -> int:
+    """
+    Rough token count (about 4 characters per token for English text)
+    """
+    return (len(text) + 3) // 4
+
+
+def normalize_whitespace(text: str) -> str:
+    """
+    Collapse runs of spaces, strip each line and squeeze blank lines
+    """
+    lines = [_HORIZONTAL_SPACE.sub(' ', line).strip() for line in text.splitlines()]
+    compacted: List[str] = []
+    for line in lines:
+        if line or (compacted and compacted[-1]):
+            compacted.append(line)
+    return '\n'.join(compacted).strip()
+
+
+def remove_repeated_lines(text: str) -> str:
+    """
+    Drop page numbers and keep only the first copy of short lines that repeat verbatim
+    about once per page, which in extracted PDF text are page headers and footers
+    """
+    lines = [line for line in text.split('\n') if not (line and _PAGE_NUMBER.match(line))]
+    positions: Dict[str, List[int]] = defaultdict(list)
+    for i, line in enumerate(lines):
+        if line and len(line) <= _MAX_HEADER_LENGTH:
+            positions[line].append(i)
+    headers = {line for line, found in positions.items()
+               if len(found) > 1 and all(b - a >= _MIN_LINES_BETWEEN_HEADERS for a, b in zip(found, found[1:]))}
+    seen = set()
+    kept: List[str] = []
+    for line in lines:
+        if line in headers:
+            if line in seen:
+                continue
+            seen.add(line)
+        kept.append(line)
+    return normalize_whitespace('\n'.join(kept))
+
+
+def _truncate_to_tokens(text: str, budget: int) -> str:
+    if estimate_tokens(text) <= budget:
+        return text
+    cut = text[:max(0, budget * 4 - len('\n[...]'))]
+    # Prefer to stop at a line break rather than mid-sentence
+    newline = cut.rfind('\n')
+    if newline > len(cut) // 2:
+        cut = cut[:newline]
+    return cut.rstrip() + '\n[...]'
+
+
+def compact_resume(resume_text: str, skills: List[str], education: List[str], work_experience: List[str],
+                   token_budget: int) -> str:
+    """
+    Build a compact, structured version of a resume for the LLM prompt.
+
+    The text is cleaned of whitespace runs, page numbers and repeated headers, then
+    prefixed with a digest of the extracted skills, education and experience. The
+    resume text is truncated so the whole digest fits within token_budget.
+    """
+    cleaned = remove_repeated_lines(normalize_whitespace(resume_text))
+
+    digest_lines = []
+    if skills:
+        digest_lines.append("Skills: " + ", ".join(sorted(skills)))
+    if education:
+        digest_lines.append("Education: " + "; ".join(sorted(education)))
+    if work_experience:
+        digest_lines.append("Experience: " + "; ".join(sorted(work_experience)))
+    header = "\n".join(digest_lines)
+    header = _truncate_to_tokens(header, token_budget // 4) if header else ""
+
+    remaining = token_budget - estimate_tokens(header) - estimate_tokens("\n\nResume text:\n")
+    body = _truncate_to_tokens(cleaned, max(0, remaining))
+    compacted = f"{header}\n\nResume text:\n{body}" if header else body
+
+    logger.info("Compacted resume for prompt: ~%d -> ~%d tokens",
+                estimate_tokens(resume_text), estimate_tokens(compacted))
+    return compacted
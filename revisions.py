@@ -0,0 +1,204 @@
+"""
+Revision-aware extraction for resumes that are edited and re-submitted.
+
+Each section of a resume is hashed. When a new revision comes in, only sections whose
+hash is new are run through the extractors; every other section reuses the previous
+revision's results. diff_revisions reports which sections were added, removed or
+edited, for the UI and for the incremental LLM prompt (see analyze_resume_revision).
+A revision keeps section digests and results, not the resume text.
+"""
+import hashlib
+from typing import Dict, FrozenSet, List, NamedTuple, Optional, Tuple
+from analyzer_core import degrees_in, education_keywords_in, experiences_in, skills_listed_in
+from metrics import metrics, timed
+from section_segmenter import Section, segment_resume
+from skill_matcher import skill_matcher
+
+
+class SectionResult(NamedTuple):
+    """
+    Extraction results that depend only on one section's text
+    """
+    skills: FrozenSet[str]
+    education: FrozenSet[str]
+    work_experience: FrozenSet[str]
+
+
+class RevisionSection(NamedTuple):
+    # Stable name used to match sections across revisions, e.g. 'experience' or 'experience#2'
+    key: str
+    heading: str
+    # Span of the section (including its heading) in the revision's text
+    start: int
+    end: int
+    digest: str
+
+
+class SectionChange(NamedTuple):
+    kind: str  # 'added', 'removed' or 'edited'
+    key: str
+    heading: str
+    # The section in the new revision (None if removed) and in the previous one (None if added)
+    current: Optional[RevisionSection]
+    previous: Optional[RevisionSection]
+
+    @property
+    def title(self) -> str:
+        return self.heading or self.key.capitalize()
+
+    @property
+    def length(self) -> int:
+        section = self.current or self.previous
+        return section.end - section.start
+
+
+def section_digest(name: str, text: str) -> str:
+    return hashlib.sha256(f"{name}\0{text}".encode('utf-8')).hexdigest()
+
+
+def extract_section(section: Section, text: str) -> SectionResult:
+    """
+    Run the extractors over one section, reading the same parts of it as
+    extract_skills, extract_education and extract_work_experience do; text is the whole
+    section including its heading
+    """
+    skills = skill_matcher.find_skills(text)
+    if section.name == 'skills':
+        skills |= skills_listed_in(section.lead)
+    education = degrees_in(section.lead) if section.name == 'education' else set()
+    work_experience = set()
+    if section.name == 'experience':
+        for i, block in enumerate(section.blocks):
+            work_experience |= experiences_in(block, section=i == 0)
+    return SectionResult(frozenset(skills), frozenset(education), frozenset(work_experience))
+
+
+class ResumeRevision:
+    """
+    One submitted version of a resume: its sections, their extraction results, and
+    the LLM analyses made of it (by target job)
+    """
+
+    def __init__(self, text: str, sections: List[RevisionSection], results: Dict[str, SectionResult],
+                 extracted: Dict[str, List[str]], reused: int):
+        self.length = len(text)
+        self.sections = sections
+        self.results = results
+        self.extracted = extracted
+        # Sections whose results came from the previous revision
+        self.reused = reused
+        self.analyses: Dict[str, Dict] = {}
+
+    def analysis_for(self, target_job: str) -> Optional[Dict]:
+        return self.analyses.get(target_job.strip().lower())
+
+    def set_analysis(self, target_job: str, analysis: Dict):
+        self.analyses[target_job.strip().lower()] = analysis
+
+
+def _keyed_sections(text: str, sections: List[Section]) -> List[Tuple[Section, RevisionSection]]:
+    keyed = []
+    seen: Dict[str, int] = {}
+    for section in sections:
+        seen[section.name] = seen.get(section.name, 0) + 1
+        key = section.name if seen[section.name] == 1 else f"{section.name}#{seen[section.name]}"
+        digest = section_digest(section.name, text[section.start:section.end])
+        keyed.append((section, RevisionSection(key, section.heading, section.start, section.end, digest)))
+    return keyed
+
+
+@timed('extract_revision')
+def extract_revision(text: str, previous: Optional[ResumeRevision] = None) -> ResumeRevision:
+    """
+    Extract skills, education and work experience, re-running the extractors only on
+    sections that differ from the previous revision. Those extractors also read each
+    section on its own (repeated sections included), so the merged results match
+    extract_skills, extract_education and extract_work_experience on the full text;
+    tests/test_revisions.py checks this.
+    """
+    cache = previous.results if previous is not None else {}
+    results: Dict[str, SectionResult] = {}
+    reused = 0
+    keyed = _keyed_sections(text, segment_resume(text))
+    for section, revision_section in keyed:
+        digest = revision_section.digest
+        if digest in results:
+            continue
+        if digest in cache:
+            results[digest] = cache[digest]
+            reused += 1
+        else:
+            results[digest] = extract_section(section, text[section.start:section.end])
+    metrics.increment('revision_sections_total', reused, result='reused')
+    metrics.increment('revision_sections_total', len(results) - reused, result='extracted')
+
+    skills, education, work_experience = set(), set(), set()
+    for result in results.values():
+        skills |= result.skills
+        education |= result.education
+        work_experience |= result.work_experience
+    names = {section.name for section, _ in keyed}
+    # These fallbacks look at the whole text, so they cannot be reused section by section
+    if not education:
+        education = education_keywords_in(text)
+    if 'experience' not in names:
+        work_experience = experiences_in(text, section=False)
+
+    extracted = {
+        'skills': list(skills),
+        'education': list(education),
+        'work_experience': list(work_experience)
+    }
+    return ResumeRevision(text, [revision_section for _, revision_section in keyed], results, extracted, reused)
+
+
+class RevisionDiff:
+    """
+    Section-level changes between two revisions of a resume
+    """
+
+    def __init__(self, changes: List[SectionChange], unchanged: int, changed_ratio: float,
+                 skills_added: List[str], skills_removed: List[str]):
+        self.changes = changes
+        self.unchanged = unchanged
+        # Characters in added, edited and removed sections relative to the new text's length
+        self.changed_ratio = changed_ratio
+        self.skills_added = skills_added
+        self.skills_removed = skills_removed
+
+    def prompt_sections(self, text: str) -> List[Tuple[str, str]]:
+        """
+        (title, text) pairs describing the changes for analyze_resume_revision, given
+        the text of the current revision
+        """
+        # Added and edited sections start with their own heading
+        return [(f"Removed section: {change.title}", '') if change.kind == 'removed' else
+                (f"{change.kind.capitalize()} section", text[change.current.start:change.current.end])
+                for change in self.changes]
+
+
+def diff_revisions(previous: ResumeRevision, current: ResumeRevision) -> RevisionDiff:
+    old = {section.key: section for section in previous.sections}
+    new = {section.key: section for section in current.sections}
+    changes = []
+    unchanged = 0
+    for section in current.sections:
+        before = old.get(section.key)
+        if before is None:
+            changes.append(SectionChange('added', section.key, section.heading, section, None))
+        elif before.digest != section.digest:
+            changes.append(SectionChange('edited', section.key, section.heading, section, before))
+        else:
+            unchanged += 1
+    for section in previous.sections:
+        if section.key not in new:
+            changes.append(SectionChange('removed', section.key, section.heading, None, section))
+
+    changed_chars = sum(change.length for change in changes)
+    old_skills = {skill.lower(): skill for skill in previous.extracted['skills']}
+    new_skills = {skill.lower(): skill for skill in current.extracted['skills']}
+    return RevisionDiff(
+        changes, unchanged, changed_chars / max(current.length, 1),
+        sorted((skill for key, skill in new_skills.items() if key not in old_skills), key=str.lower),
+        sorted((skill for key, skill in old_skills.items() if key not in new_skills), key=str.lower)
+    )
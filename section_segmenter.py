@@ -0,0 +1,89 @@
+import re
+from typing import Dict, List, NamedTuple
+from metrics import timed
+
+# Canonical section name -> heading phrases that introduce it (matched case-insensitively)
+SECTION_HEADINGS: Dict[str, List[str]] = {
+    'summary': ['professional summary', 'summary', 'profile', 'objective', 'about me'],
+    'skills': ['technical skills', 'core competencies', 'skills', 'technologies', 'expertise'],
+    'education': ['education', 'academic background', 'qualifications'],
+    'experience': ['work experience', 'professional experience', 'employment history', 'career history',
+                   'professional background', 'experience', 'employment'],
+    'projects': ['projects'],
+    'certifications': ['certifications', 'certificates', 'licenses'],
+    'publications': ['publications'],
+    'awards': ['awards', 'honors', 'achievements'],
+    'languages': ['languages'],
+    'interests': ['interests', 'hobbies'],
+    'references': ['references'],
+}
+
+_HEADING_TO_SECTION = {heading: name for name, headings in SECTION_HEADINGS.items() for heading in headings}
+
+# A heading is a line that starts with a known phrase followed by a colon/dash or the end of
+# the line, or any 'Word:' line (which has always ended a section). Longer phrases come first
+# so 'work experience' wins over 'experience'. Every branch is a bounded literal, so the
+# whole document is segmented in one linear scan.
+_HEADING = re.compile(
+    r'^[ \t]*(?:(?i:(?P<known>' +
+    '|'.join(re.escape(heading) for heading in sorted(_HEADING_TO_SECTION, key=len, reverse=True)) +
+    r'))[ \t]*(?:[:\-–][ \t]*|$)|(?P<generic>[A-Z][a-z]{1,40}):)',
+    re.MULTILINE
+)
+_BLANK_LINE = re.compile(r'\n[ \t\r]*\n')
+
+
+class Section(NamedTuple):
+    name: str
+    heading: str
+    start: int
+    end: int
+    body: str
+
+    @property
+    def blocks(self) -> List[str]:
+        """
+        The body split at blank lines, e.g. one block per job in an experience section
+        """
+        return [block for block in _BLANK_LINE.split(self.body) if block.strip()]
+
+    @property
+    def lead(self) -> str:
+        """
+        The first block of the body: a list section such as skills ends there, so
+        prose after it is not read as part of the list
+        """
+        blocks = self.blocks
+        return blocks[0].lstrip(' \t\r\n') if blocks else ''
+
+
+@timed('segment_resume')
+def segment_resume(text: str) -> List[Section]:
+    """
+    Split resume text into headed sections in a single pass.
+    Text before the first heading is returned as a 'header' section.
+    """
+    sections: List[Section] = []
+    matches = list(_HEADING.finditer(text))
+    if not matches or matches[0].start() > 0:
+        end = matches[0].start() if matches else len(text)
+        if text[:end].strip():
+            sections.append(Section('header', '', 0, end, text[:end]))
+
+    for i, match in enumerate(matches):
+        end = matches[i + 1].start() if i + 1 < len(matches) else len(text)
+        if match.group('known') is not None:
+            heading = match.group('known')
+            name = _HEADING_TO_SECTION[heading.lower()]
+        else:
+            heading = match.group('generic')
+            name = heading.lower()
+        sections.append(Section(name, heading, match.start(), end, text[match.end():end]))
+    return sections
+
+
+def section_leads(sections: List[Section], name: str) -> List[str]:
+    """
+    Return the lead of every section with the given name, one entry per section
+    """
+    return [section.lead for section in sections if section.name == name]
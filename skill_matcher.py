@@ -0,0 +1,108 @@
+import json
+import re
+from typing import Dict, FrozenSet, Iterable, List, Optional, Set, Tuple
+from config import config
+
+
+class _TrieNode:
+    __slots__ = ('children', 'names')
+
+    def __init__(self):
+        self.children: Dict[str, '_TrieNode'] = {}
+        self.names: List[str] = []
+
+
+class SkillMatcher:
+    """
+    Find every known skill in a text with a single precompiled regex.
+
+    The skill terms (canonical names and aliases) are folded into a trie which is
+    emitted as one nested alternation inside a lookahead. Each term ends in an empty
+    capture group guarded by a word boundary, so a single scan reports every term
+    starting at each position, including overlapping ones like 'React' and
+    'React Native'. Matching behaves exactly like running
+    re.search(r'\\b' + re.escape(term) + r'\\b', text, re.IGNORECASE) per term.
+    """
+
+    def __init__(self, skills: Iterable[str], aliases: Optional[Dict[str, str]] = None):
+        self.skills: List[str] = list(dict.fromkeys(skills))
+        self.canonical_skills: FrozenSet[str] = frozenset(self.skills)
+        self.aliases: Dict[str, str] = dict(aliases or {})
+
+        unknown = [alias for alias, skill in self.aliases.items() if skill not in self.canonical_skills]
+        if unknown:
+            raise ValueError(f"Aliases point to unknown skills: {', '.join(sorted(unknown))}")
+
+        root = _TrieNode()
+        terms: List[Tuple[str, str]] = [(skill, skill) for skill in self.skills]
+        terms += list(self.aliases.items())
+        for term, skill in terms:
+            if not term:
+                continue
+            node = root
+            for ch in term.lower():
+                node = node.children.setdefault(ch, _TrieNode())
+            if skill not in node.names:
+                node.names.append(skill)
+
+        # Group index -> skills named by that term, and group index -> enclosing terms
+        self._group_names: Dict[int, Tuple[str, ...]] = {}
+        self._group_ancestors: Dict[int, Tuple[int, ...]] = {}
+        body = self._emit_children(root, ())
+        self.pattern = re.compile(r'(?=\b(?:' + body + r'))', re.IGNORECASE) if body else None
+
+    @classmethod
+    def from_file(cls, path: str) -> 'SkillMatcher':
+        """
+        Build a matcher from a JSON taxonomy file
+        """
+        with open(path, encoding='utf-8') as f:
+            taxonomy = json.load(f)
+        skills = [skill for category in taxonomy.get('categories', {}).values() for skill in category]
+        return cls(skills, taxonomy.get('aliases', {}))
+
+    def _emit_children(self, node: _TrieNode, ancestors: Tuple[int, ...]) -> str:
+        branches = []
+        for ch, child in node.children.items():
+            # Collapse non-branching, non-terminal chains into a single literal
+            literal = ch
+            while not child.names and len(child.children) == 1:
+                (next_ch, child), = child.children.items()
+                literal += next_ch
+
+            branch = re.escape(literal)
+            child_ancestors = ancestors
+            if child.names:
+                group = len(self._group_names) + 1
+                self._group_names[group] = tuple(child.names)
+                self._group_ancestors[group] = ancestors
+                child_ancestors = ancestors + (group,)
+                branch += r'(?:\b())?'
+            if child.children:
+                branch += '(?:' + self._emit_children(child, child_ancestors) + ')?'
+            branches.append(branch)
+        return '|'.join(branches)
+
+    def find_skills(self, text: str) -> Set[str]:
+        """
+        Return the canonical names of all skills mentioned in the text
+        """
+        found: Set[str] = set()
+        if self.pattern is None:
+            return found
+        group_names = self._group_names
+        group_ancestors = self._group_ancestors
+        for match in self.pattern.finditer(text):
+            deepest = match.lastindex
+            if deepest is None:
+                continue
+            found.update(group_names[deepest])
+            # Shorter terms on the same path only count if their own boundary held
+            for group in group_ancestors[deepest]:
+                if match.start(group) != -1:
+                    found.update(group_names[group])
+        return found
+
+
+# Built once at import so every call shares the compiled pattern
+skill_matcher = SkillMatcher.from_file(config.SKILL_TAXONOMY_PATH)
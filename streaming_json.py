@@ -0,0 +1,99 @@
+import json
+from typing import Dict, List, Optional, Tuple
+
+
+class StreamingAnalysisParser:
+    """
+    Incrementally parse a streamed JSON object whose values are lists of strings,
+    e.g. {"strengths": ["...", "..."], "improvements": [...]}.
+
+    Text can be fed in arbitrary chunks; feed() returns every list item completed by
+    that chunk as a (key, item) pair. Anything before the opening brace (such as a
+    ```json fence) is skipped, and items received so far stay in result even if the
+    stream stops part way through.
+    """
+
+    def __init__(self):
+        self.result: Dict[str, List[str]] = {}
+        self._stack: List[str] = []
+        self._started = False
+        self._done = False
+        self._expecting_key = False
+        self._current_key: Optional[str] = None
+        self._in_string = False
+        self._escape = False
+        self._string_role: Optional[str] = None
+        self._buffer: List[str] = []
+
+    @property
+    def complete(self) -> bool:
+        """
+        Whether the top-level object has been closed
+        """
+        return self._done
+
+    def feed(self, chunk: str) -> List[Tuple[str, str]]:
+        """
+        Consume the next chunk of text and return the list items it completed
+        """
+        events: List[Tuple[str, str]] = []
+        for ch in chunk:
+            if self._in_string:
+                if self._escape:
+                    self._buffer.append(ch)
+                    self._escape = False
+                elif ch == '\\':
+                    self._buffer.append(ch)
+                    self._escape = True
+                elif ch == '"':
+                    self._in_string = False
+                    self._end_string(events)
+                else:
+                    self._buffer.append(ch)
+                continue
+
+            if self._done:
+                break
+            if not self._started:
+                if ch == '{':
+                    self._started = True
+                    self._stack.append(ch)
+                    self._expecting_key = True
+                continue
+
+            depth = len(self._stack)
+            if ch == '"':
+                self._in_string = True
+                self._buffer = []
+                if depth == 1 and self._expecting_key:
+                    self._string_role = 'key'
+                elif depth == 2 and self._stack[-1] == '[':
+                    self._string_role = 'item'
+                else:
+                    self._string_role = None
+            elif ch in '{[':
+                self._stack.append(ch)
+                if depth == 1 and ch == '[' and self._current_key is not None:
+                    self.result.setdefault(self._current_key, [])
+            elif ch in '}]':
+                self._stack.pop()
+                if not self._stack:
+                    self._done = True
+            elif ch == ',' and depth == 1:
+                self._expecting_key = True
+            elif ch == ':' and depth == 1:
+                self._expecting_key = False
+        return events
+
+    def _end_string(self, events: List[Tuple[str, str]]):
+        raw = ''.join(self._buffer)
+        try:
+            value = json.loads('"' + raw + '"')
+        except ValueError:
+            value = raw
+        if self._string_role == 'key':
+            self._current_key = value
+            self._expecting_key = False
+        elif self._string_role == 'item' and self._current_key is not None:
+            self.result.setdefault(self._current_key, []).append(value)
+            events.append((self._current_key, value))
@@ -0,0 +1,96 @@
+"""
+LLMClient retries and analyze_many ordering, against the local stub server.
+"""
+import asyncio
+import json
+import re
+import time
+from types import SimpleNamespace
+import pytest
+import analyzer_core
+import llm_client as llm_client_module
+from benchmarks.stub_llm_server import CANNED_ANALYSIS, StubLLMServer
+from config import config
+from llm_client import LLMClient, LLMError
+
+PAYLOAD = {"model": "stub", "messages": [{"role": "user", "content": "Analyze this resume"}]}
+
+
+@pytest.fixture
+def server():
+    with StubLLMServer() as stub:
+        yield stub
+
+
+@pytest.fixture
+def sleeps(monkeypatch):
+    """
+    Backoff delays the client asked for, without actually waiting
+    """
+    delays = []
+    monkeypatch.setattr(llm_client_module, 'time',
+                        SimpleNamespace(sleep=delays.append, time=time.time, perf_counter=time.perf_counter))
+    return delays
+
+
+def make_client(server, **options):
+    options = dict({'max_retries': 3, 'backoff_base': 0.01, 'backoff_max': 30.0, 'timeout': 5.0}, **options)
+    return LLMClient(server.url, 'test-key', **options)
+
+
+def analysis_of(response):
+    return json.loads(response['choices'][0]['message']['content'])
+
+
+@pytest.mark.parametrize('status', [429, 500, 502, 503, 504])
+def test_retryable_status_then_success(server, sleeps, status):
+    server.fail_next(status, count=2)
+    assert analysis_of(make_client(server).chat_completion(PAYLOAD)) == CANNED_ANALYSIS
+    assert server.requests == 3
+    assert len(sleeps) == 2 and all(0 <= delay <= 0.04 for delay in sleeps)
+
+
+def test_retry_after_is_honoured(server, sleeps):
+    server.fail_next(429, retry_after='2')
+    assert analysis_of(make_client(server).chat_completion(PAYLOAD)) == CANNED_ANALYSIS
+    assert sleeps == [2.0]
+
+
+def test_gives_up_after_max_retries(server, sleeps):
+    server.fail_next(503, count=10)
+    with pytest.raises(LLMError) as error:
+        make_client(server, max_retries=2).chat_completion(PAYLOAD)
+    assert error.value.status_code == 503
+    assert server.requests == 3
+    assert len(sleeps) == 2
+
+
+def test_retry_after_above_backoff_max_raises_immediately(server, sleeps):
+    server.fail_next(429, retry_after='120')
+    with pytest.raises(LLMError, match="Retry-After 120s") as error:
+        make_client(server, backoff_max=30.0).chat_completion(PAYLOAD)
+    assert error.value.status_code == 429
+    assert server.requests == 1
+    assert sleeps == []
+
+
+def test_other_errors_are_not_retried(server, sleeps):
+    server.fail_next(400)
+    with pytest.raises(LLMError) as error:
+        make_client(server).chat_completion(PAYLOAD)
+    assert error.value.status_code == 400
+    assert server.requests == 1
+
+
+def test_analyze_many_keeps_input_order(monkeypatch):
+    with StubLLMServer(latency=0.01, jitter=0.05, seed=3) as stub:
+        # Echo the target role back, so each result shows which request it answers
+        stub.respond = lambda payload: dict(CANNED_ANALYSIS, strengths=re.findall(
+            r"target job role '([^']*)'", payload['messages'][0]['content']))
+        monkeypatch.setattr(config, 'OPENROUTER_API_KEY', 'test-key')
+        monkeypatch.setattr(analyzer_core.llm_client, 'base_url', stub.url)
+        roles = [f"Role {i}" for i in range(12)]
+        analyses = asyncio.run(analyzer_core.analyze_many([("Skills: Python", role) for role in roles],
+                                                          max_concurrency=4, use_cache=False))
+        assert [analysis['strengths'] for analysis in analyses] == [[role] for role in roles]
+        assert stub.requests == len(roles)
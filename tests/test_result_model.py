@@ -0,0 +1,68 @@
+"""
+Compact result model: binary round-trips and skill set overlap.
+"""
+import pytest
+import result_model
+from result_model import AnalysisResult, SkillSet, SkillVocabulary
+
+
+def make_result(**overrides):
+    fields = dict(skills=['Python', 'Kubernetes', 'Underwater Basketry'],
+                  education=['M.A. in History at Yale University', 'Bachelor of Science'],
+                  work_experience=['Data Analyst at Initech LLC'],
+                  target_job='Data Scientist',
+                  analysis={'strengths': ['Quantified impact'], 'missing_skills': ['Spark']})
+    fields.update(overrides)
+    return AnalysisResult.from_extracted(**fields)
+
+
+def test_round_trip():
+    result = make_result()
+    decoded = AnalysisResult.from_bytes(result.to_bytes())
+    assert decoded == result
+    assert [entry.level for entry in decoded.education] == [2, 1]
+
+
+def test_round_trip_without_analysis():
+    result = make_result(analysis=None)
+    assert AnalysisResult.from_bytes(result.to_bytes()) == result
+
+
+def test_round_trip_above_64_kib():
+    long_entry = 'Led ' + 'x' * 70000 + ' at Initech LLC'
+    many_skills = [f'Skill {i}' for i in range(70000)]
+    result = make_result(skills=many_skills, work_experience=[long_entry],
+                         analysis={'strengths': ['y' * 70000]})
+    decoded = AnalysisResult.from_bytes(result.to_bytes())
+    assert decoded.work_experience[0].text == long_entry
+    assert len(decoded.skills) == 70000
+    assert decoded == result
+
+
+def test_decodes_from_memoryview():
+    result = make_result()
+    buffer = bytearray(b'\0' * 16 + result.to_bytes())
+    assert AnalysisResult.from_bytes(memoryview(buffer)[16:]) == result
+
+
+def test_rejects_other_data():
+    with pytest.raises(ValueError, match="Not a serialized AnalysisResult"):
+        AnalysisResult.from_bytes(b'JUNK' + make_result().to_bytes()[4:])
+
+
+def test_rejects_blob_from_a_different_taxonomy(monkeypatch):
+    data = make_result().to_bytes()
+    other = SkillVocabulary(list(result_model.vocabulary.skills) + ['Underwater Basketry'])
+    monkeypatch.setattr(result_model, 'vocabulary', other)
+    with pytest.raises(ValueError, match="different skill taxonomy"):
+        AnalysisResult.from_bytes(data)
+
+
+def test_overlap_with_required_skills():
+    skills = SkillSet.from_names(['Python', 'SQL', 'Docker', 'Underwater Basketry'])
+    required = SkillSet.from_names(['python', 'SQL', 'Kubernetes', 'Underwater Basketry'])
+    assert skills.common_count(required) == 3
+    assert skills.overlap(required) == 0.75
+    assert sorted(required - skills) == ['Kubernetes']
+    assert skills.overlap(SkillSet()) == 1.0
+    assert SkillSet().overlap(required) == 0.0
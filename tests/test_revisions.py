@@ -0,0 +1,61 @@
+"""
+extract_revision must give the same results as running the extractors on the full text,
+whether every section is extracted or most are reused from the previous revision.
+"""
+import pytest
+from analyzer_core import extract_education, extract_skills, extract_work_experience
+from benchmarks.corpus import generate_corpus
+from revisions import diff_revisions, extract_revision
+from section_segmenter import segment_resume
+
+EDGE_CASES = [
+    # Repeated sections are extracted one by one, never from their joined text
+    "Skills: Python, Java\n\nProjects: x\n\nSkills: Go, Rust",
+    "Education:\nMaster of Science at Boston College\n\nSkills: Go\n\n"
+    "Education:\nBachelor of Arts at Yale University",
+    "Work Experience:\nData Analyst at Initech LLC\n\nProjects: x\n\n"
+    "Work Experience:\nSoftware Engineer at Acme Inc\n- Built a data pipeline",
+    # Prose after a skills list is not part of it
+    "Skills: Python, Java\n\nI led a team serving banks, retail, and insurance.",
+    # No education or experience section: the whole-text fallbacks apply
+    "Jane Doe\nSoftware Engineer at Acme Inc, Bachelor of Science, Stanford University",
+    "",
+]
+
+
+def full_extraction(text):
+    sections = segment_resume(text)
+    return {
+        'skills': set(extract_skills(text, sections)),
+        'education': set(extract_education(text, sections)),
+        'work_experience': set(extract_work_experience(text, sections))
+    }
+
+
+def as_sets(extracted):
+    return {key: set(values) for key, values in extracted.items()}
+
+
+@pytest.mark.parametrize('text', EDGE_CASES + generate_corpus(60, seed=3))
+def test_extract_revision_matches_full_extraction(text):
+    assert as_sets(extract_revision(text).extracted) == full_extraction(text)
+
+
+@pytest.mark.parametrize('text', generate_corpus(20, seed=4, layout='standard'))
+def test_incremental_extraction_matches_full_extraction(text):
+    previous = extract_revision(text)
+    edited = text.replace('\n\n', '\n\nSkills: Rust, Scala\n\n', 1) + "\nEducation:\nMaster of Arts at Yale University\n"
+    revision = extract_revision(edited, previous)
+    assert revision.reused > 0
+    assert as_sets(revision.extracted) == full_extraction(edited)
+
+
+def test_diff_revisions_reports_changed_sections():
+    text = "Skills: Python, Java\n\nWork Experience:\nData Analyst at Initech LLC\n\n"
+    edited = "Skills: Python, Java, Rust\n\nWork Experience:\nData Analyst at Initech LLC\n\nAwards: none\n"
+    diff = diff_revisions(extract_revision(text), extract_revision(edited))
+    assert [(change.kind, change.key) for change in diff.changes] == [('edited', 'skills'), ('added', 'awards')]
+    assert diff.unchanged == 1
+    assert diff.skills_added == ['Rust']
+    assert diff.prompt_sections(edited) == [('Edited section', "Skills: Python, Java, Rust\n\n"),
+                                            ('Added section', "Awards: none\n")]
@@ -0,0 +1,91 @@
+"""
+SkillMatcher.find_skills must give exactly the results of searching for each term on
+its own with re.search(r'\b' + re.escape(term) + r'\b', text, re.IGNORECASE).
+"""
+import random
+import re
+import pytest
+from skill_matcher import SkillMatcher, skill_matcher
+
+
+def reference_find_skills(matcher, text):
+    found = set()
+    terms = [(skill, skill) for skill in matcher.skills] + list(matcher.aliases.items())
+    for term, skill in terms:
+        if re.search(r'\b' + re.escape(term) + r'\b', text, re.IGNORECASE):
+            found.add(skill)
+    return found
+
+
+TRICKY_TEXTS = [
+    "React Native and React",
+    "React Native only",
+    "Reactive programming, ReactJS",
+    "JavaScript but no Java",
+    "Java, then JavaScript",
+    "java/javascript",
+    "C++ and C#",
+    "C++11, C#.NET, C++/CLI",
+    "c++",
+    "Ruby on Rails",
+    "Ruby, Rails",
+    "Ruby on Railsy",
+    "Node.js, Node, node.jsx",
+    "Nodejs",
+    "R and Go; Rust; Golang; go-to",
+    "CI/CD pipelines, CI/CDs",
+    "UI/UX design, ASP.NET MVC",
+    "Machine Learning and Deep-Learning; machine learning",
+    "PYTHON python Python3 _python",
+    "",
+    "Skills: Python, Java\n\nI led a team serving banks, retail, and insurance.",
+]
+
+# Word characters, separators and fragments of taxonomy terms, so random texts hit
+# partial terms, terms glued to other words and terms that overlap
+_FRAGMENTS = ['React', 'Native', 'Java', 'Script', 'C', '++', '#', 'Ruby', 'on', 'Rails', 'Node', '.js',
+              'R', 'Go', 'SQL', 'My', 'Postgre', 'CI', '/', 'CD', 'UI', 'UX', 'ASP', '.NET', 'Machine',
+              'Learning', 'Data', 'Science', 'Analysis', 'x', '_', '1', '-', '.', ',', ' ', ' ', '\n']
+
+
+def random_texts(count, seed):
+    rng = random.Random(seed)
+    terms = skill_matcher.skills
+    texts = []
+    for _ in range(count):
+        parts = [rng.choice(_FRAGMENTS) if rng.random() < 0.6 else rng.choice(terms) for _ in range(rng.randint(1, 12))]
+        texts.append(''.join(part.lower() if rng.random() < 0.2 else part for part in parts))
+    return texts
+
+
+@pytest.mark.parametrize('text', TRICKY_TEXTS)
+def test_tricky_texts_match_per_term_search(text):
+    assert skill_matcher.find_skills(text) == reference_find_skills(skill_matcher, text)
+
+
+def test_overlapping_and_non_word_terms():
+    assert skill_matcher.find_skills("React Native") == {'React', 'React Native'}
+    assert skill_matcher.find_skills("JavaScript") == {'JavaScript'}
+    assert skill_matcher.find_skills("Ruby on Rails") == {'Ruby', 'Ruby on Rails'}
+    # \b after a trailing '+' or '#' needs a word character next, as with re.search
+    assert skill_matcher.find_skills("C++ and C#") == set()
+    assert skill_matcher.find_skills("C++11, C#x") == {'C++', 'C#'}
+    assert skill_matcher.find_skills("Node.js, Node.jsx") == {'Node.js'}
+
+
+def test_random_texts_match_per_term_search():
+    mismatches = [text for text in random_texts(3000, seed=1)
+                  if skill_matcher.find_skills(text) != reference_find_skills(skill_matcher, text)]
+    assert mismatches == []
+
+
+def test_aliases_resolve_to_canonical_names():
+    matcher = SkillMatcher(['Kubernetes', 'JavaScript', 'Java'], {'k8s': 'Kubernetes', 'JS': 'JavaScript'})
+    for text in ["Ran K8s clusters", "k8sx", "JS and Java", "Node JS", "JSON"]:
+        assert matcher.find_skills(text) == reference_find_skills(matcher, text)
+    assert matcher.find_skills("Ran K8s clusters in JS") == {'Kubernetes', 'JavaScript'}
+
+
+def test_alias_to_unknown_skill_is_rejected():
+    with pytest.raises(ValueError, match="k8s"):
+        SkillMatcher(['Docker'], {'k8s': 'Kubernetes'})